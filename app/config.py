@@ -4,9 +4,10 @@ Loads configuration from environment variables or .env file.
 """
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import field_validator, ValidationError
+from pydantic import PrivateAttr, field_validator, ValidationError
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import socket
 import logging
 import sys
@@ -25,6 +26,11 @@ _PLACEHOLDER_VALUES = {
     "secret",
 }
 
+# Accepted LOG_LEVEL values: the tuple keeps severity order for the error
+# message, the frozenset is the O(1) membership test.
+_LOG_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_VALID_LOG_LEVELS = frozenset(_LOG_LEVEL_NAMES)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -55,10 +61,25 @@ class Settings(BaseSettings):
     # None = disabled (black screen when idle).
     idle_video_path: Optional[Path] = None
 
+    # Explicit ffmpeg binary. Blank = look it up on PATH once at startup.
+    ffmpeg_path: str = ""
+
     # Single-admin-only operating mode: rejects non-admin login and exposes
     # an admin search-and-queue-for-others card. Off by default.
     pilot_mode: bool = False
 
+    # Auto-detected LAN IP, memoized after the first successful probe so URL
+    # generation does not open a UDP socket per call. Never set from env.
+    _detected_ip: Optional[str] = PrivateAttr(default=None)
+    # "http://host:port/data/videos/" frozen at startup by
+    # freeze_video_url_prefix(); None until then (URLs resolved per call).
+    _video_url_prefix: Optional[str] = PrivateAttr(default=None)
+    # (data_dir, db_path, videos_dir), rebuilt only when data_dir is
+    # reassigned (tests point it at a tmp dir after construction).
+    _paths: Optional[Tuple[Path, Path, Path]] = PrivateAttr(default=None)
+    # /.dockerenv existence; cannot change during the process lifetime.
+    _is_docker: Optional[bool] = PrivateAttr(default=None)
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
     )
@@ -67,7 +88,7 @@ class Settings(BaseSettings):
     @classmethod
     def validate_admin_password(cls, v: str) -> str:
         """Validate admin password is set, non-placeholder, and long enough."""
-        if not v or len(v.strip()) == 0:
+        if not v or v.isspace():
             raise ValueError("ADMIN_PASSWORD cannot be empty")
         if v.strip().lower() in _PLACEHOLDER_VALUES:
             raise ValueError(
@@ -85,7 +106,7 @@ class Settings(BaseSettings):
     @classmethod
     def validate_youtube_api_key(cls, v: str) -> str:
         """Validate YouTube API key is not empty."""
-        if not v or len(v.strip()) == 0:
+        if not v or v.isspace():
             raise ValueError("YOUTUBE_API_KEY cannot be empty")
         return v
 
@@ -93,7 +114,7 @@ class Settings(BaseSettings):
     @classmethod
     def validate_secret_key(cls, v: str) -> str:
         """Validate secret key is set, non-placeholder, and long enough."""
-        if not v or len(v.strip()) == 0:
+        if not v or v.isspace():
             raise ValueError("SECRET_KEY cannot be empty")
         if v.strip().lower() in _PLACEHOLDER_VALUES:
             raise ValueError(
@@ -111,11 +132,12 @@ class Settings(BaseSettings):
     @classmethod
     def validate_log_level(cls, v: str) -> str:
         """Validate log level is valid."""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        if v in _VALID_LOG_LEVELS:  # already canonical (the common case)
+            return v
         v_upper = v.upper()
-        if v_upper not in valid_levels:
+        if v_upper not in _VALID_LOG_LEVELS:
             raise ValueError(
-                f"LOG_LEVEL must be one of: {', '.join(valid_levels)}. Got: {v}"
+                f"LOG_LEVEL must be one of: {', '.join(_LOG_LEVEL_NAMES)}. Got: {v}"
             )
         return v_upper
 
@@ -136,34 +158,57 @@ class Settings(BaseSettings):
             return None
         return v
 
+    # Reading a PrivateAttr goes through pydantic's BaseModel.__getattr__,
+    # which costs ~30x a plain field read. The per-call getters below
+    # therefore read the private dict once into a local.
+
+    def _derived_paths(self) -> Tuple[Path, Path, Path]:
+        """Return (data_dir, db_path, videos_dir), rebuilding if data_dir changed."""
+        private = self.__pydantic_private__
+        data_dir = self.data_dir
+        paths = private["_paths"]
+        if paths is None or paths[0] is not data_dir:
+            paths = (data_dir, data_dir / "karaoke.db", data_dir / "videos")
+            private["_paths"] = paths
+        return paths
+
     def get_db_path(self) -> Path:
         """Get the full path to the SQLite database file."""
-        return self.data_dir / "karaoke.db"
+        return self._derived_paths()[1]
 
     def get_videos_dir(self) -> Path:
         """Get the full path to the videos directory."""
-        return self.data_dir / "videos"
+        return self._derived_paths()[2]
 
     def get_video_path(self, video_id: str) -> Path:
         """Get the full path to a specific video file."""
-        return self.get_videos_dir() / f"{video_id}.mp4"
+        return self._derived_paths()[2] / f"{video_id}.mp4"
 
     def is_docker(self) -> bool:
         """
         Check if running inside a Docker container.
 
+        The stat of /.dockerenv runs once per instance; the answer is cached.
+
         Returns:
             True if running in Docker, False otherwise
         """
-        return Path("/.dockerenv").exists()
+        if self._is_docker is None:
+            self._is_docker = Path("/.dockerenv").exists()
+        return self._is_docker
 
     def get_local_ip(self) -> str:
         """
         Auto-detect the local network IP address.
 
+        The first successful probe is cached on the instance; a failed probe is
+        not, so a network that comes up after startup is picked up later.
+
         Returns:
             Local IP address or 'localhost' if detection fails
         """
+        if self._detected_ip is not None:
+            return self._detected_ip
         try:
             # Create a socket connection to determine local IP
             # This doesn't actually send data, just determines routing
@@ -171,6 +216,7 @@ class Settings(BaseSettings):
             s.connect(("8.8.8.8", 80))
             local_ip = s.getsockname()[0]
             s.close()
+            self._detected_ip = local_ip
             return local_ip
         except Exception as e:
             logger.warning(f"Failed to auto-detect local IP: {e}")
@@ -201,11 +247,32 @@ class Settings(BaseSettings):
             )
             return ""
 
-        # Auto-detect for development
+        # Auto-detect for development (get_local_ip caches the probe result)
         detected_ip = self.get_local_ip()
-        logger.info(f"Auto-detected server host: {detected_ip}")
+        logger.debug(f"Auto-detected server host: {detected_ip}")
         return detected_ip
 
+    def freeze_video_url_prefix(self) -> str:
+        """
+        Resolve the server host once and freeze the video URL prefix.
+
+        Host and port do not change after startup, so the lifespan calls this
+        once and get_video_url() becomes a single string concatenation. The
+        unreachable-host warning is emitted here, once, instead of per URL.
+
+        Returns:
+            The frozen prefix, e.g. 'http://192.168.1.10:8000/data/videos/'
+        """
+        host = self.get_server_host() or "localhost"
+        prefix = f"http://{host}:{self.server_port}/data/videos/"
+        if host == "localhost":
+            logger.warning(
+                f"Chromecast URLs will use '{host}' - this may not be accessible! "
+                f"Prefix: {prefix}"
+            )
+        self._video_url_prefix = prefix
+        return prefix
+
     def get_video_url(self, video_id: str, request_host: str = None) -> str:
         """
         Generate the HTTP URL for a video file that Chromecast can access.
@@ -217,6 +284,10 @@ class Settings(BaseSettings):
         Returns:
             Full HTTP URL to the video file
         """
+        prefix = self.__pydantic_private__["_video_url_prefix"]
+        if prefix is not None and request_host is None:
+            return prefix + video_id + ".mp4"
+
         host = self.get_server_host() or request_host or "localhost"
         url = f"http://{host}:{self.server_port}/data/videos/{video_id}.mp4"
 
@@ -278,6 +349,7 @@ def load_settings() -> Settings:
             "  - PLAYER_BACKEND: 'chromecast' (default) or 'mpv' (local HDMI output)"
         )
         logger.error("  - DATA_DIR: Data directory path (default: ./data)")
+        logger.error("  - FFMPEG_PATH: ffmpeg binary (default: found on PATH)")
         logger.error("")
         logger.error("Create a .env file or set these environment variables.")
         logger.error("See DEVELOPMENT.md for setup instructions.")
@@ -286,5 +358,23 @@ def load_settings() -> Settings:
         sys.exit(1)
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings, loading (and validating) it only once.
+
+    Import `settings` from this module, or call this, rather than constructing
+    Settings() directly - every construction re-reads .env and re-runs all
+    validators. .env is therefore parsed exactly once per process. Under
+    `uvicorn --reload` each reload is a fresh worker process, so no in-memory
+    memo can survive it; pre-parsing .env into Settings(**values) would also
+    wrongly let .env override real environment variables.
+
+    Returns:
+        The shared Settings instance
+    """
+    return load_settings()
+
+
 # Global settings instance
-settings = load_settings()
+settings = get_settings()
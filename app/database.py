@@ -6,11 +6,18 @@ Simple, direct SQL queries without ORM overhead.
 import aiosqlite
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from pathlib import Path
+from typing import AsyncGenerator, Optional
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# App-lifetime connection opened by open_db() in the lifespan. get_db() hands
+# this out instead of opening (and PRAGMA-configuring) a connection per call.
+# aiosqlite runs every statement on the connection's single worker thread, so
+# concurrent coroutines are serialized there.
+_connection: Optional[aiosqlite.Connection] = None
+
 
 # SQL schema for the queue table.
 # Intentionally NO unique constraint on video_id: multiple users can each queue
@@ -37,6 +44,60 @@ CREATE_QUEUE_INDEX = """
 CREATE INDEX IF NOT EXISTS idx_queue_added_at ON queue(added_at)
 """
 
+# Partial index over the active (not yet completed) rows, in play order. Every
+# hot-path query filters on status != 'completed', which a (status, added_at)
+# index cannot serve together with ORDER BY added_at; this one covers the
+# playout/queue listing, the active count and the duplicate check while
+# staying as small as the live queue rather than the whole history.
+CREATE_ACTIVE_QUEUE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_queue_active ON queue(added_at)
+WHERE status != 'completed'
+"""
+
+# The now-playing lookup (admin status poll) matches status = 'playing', which
+# SQLite cannot prove implies the index above; this one holds at most one row.
+CREATE_PLAYING_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_queue_playing ON queue(id) WHERE status = 'playing'
+"""
+
+# Hot-path queue statements, shared by queue_manager and the playout thread.
+# sqlite3 caches prepared statements keyed by the exact SQL text, so every
+# call site using the same constant reuses one compiled statement instead of
+# re-parsing near-duplicate strings.
+QUEUE_SELECT_COLUMNS = (
+    "id, video_id, title, thumbnail_url, duration, views, username, added_at, status"
+)
+SQL_SELECT_ACTIVE_QUEUE = (
+    f"SELECT {QUEUE_SELECT_COLUMNS} FROM queue "
+    "WHERE status != 'completed' ORDER BY added_at ASC"
+)
+SQL_SELECT_PLAYING = (
+    f"SELECT {QUEUE_SELECT_COLUMNS} FROM queue WHERE status = 'playing' LIMIT 1"
+)
+SQL_COUNT_ACTIVE = "SELECT COUNT(*) AS count FROM queue WHERE status != 'completed'"
+SQL_SELECT_OWNER = "SELECT username FROM queue WHERE id = ?"
+# Inserts unless the same user already has the video in the active queue:
+# the duplicate check and the write are one statement, so two concurrent adds
+# cannot both pass the check. rowcount is 0 when it was a duplicate.
+SQL_INSERT_QUEUE = (
+    "INSERT INTO queue "
+    "(video_id, title, thumbnail_url, duration, views, username, added_at, status) "
+    "SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, 'queued' WHERE NOT EXISTS ("
+    "SELECT 1 FROM queue WHERE video_id = ?1 AND username = ?6 "
+    "AND status != 'completed')"
+)
+SQL_UPDATE_STATUS = "UPDATE queue SET status = ? WHERE id = ?"
+SQL_DELETE_BY_ID = "DELETE FROM queue WHERE id = ?"
+SQL_DELETE_OWNED = "DELETE FROM queue WHERE id = ? AND username = ?"
+# added_at is always written as a UTC ISO 8601 string, so a plain comparison
+# against a cutoff in the same form orders correctly and can range-scan
+# idx_queue_added_at (wrapping the column in datetime() could not).
+SQL_DELETE_OLDER_THAN = "DELETE FROM queue WHERE added_at < ?"
+
+# Prepared-statement LRU size per connection (sqlite3 default: 128). Sized so
+# the fixed set above plus ad-hoc admin/cleanup statements never evict.
+STATEMENT_CACHE_SIZE = 256
+
 
 async def _migrate_drop_unique_video_id(db: aiosqlite.Connection) -> None:
     """Rebuild the queue table to drop a legacy UNIQUE(video_id) constraint.
@@ -69,10 +130,55 @@ async def _migrate_drop_unique_video_id(db: aiosqlite.Connection) -> None:
     logger.info("Queue table migration complete")
 
 
+async def _verify_db(db: aiosqlite.Connection, db_path: Path) -> None:
+    """Run the startup self-checks: file exists, table exists, read, write.
+
+    Every check duplicates what CREATE TABLE IF NOT EXISTS already proved, so
+    init_db only runs them when DEBUG logging is enabled (troubleshooting a
+    new install), keeping three extra round-trips and a transaction off every
+    normal boot.
+
+    Args:
+        db: The open init_db connection.
+        db_path: Path of the database file.
+
+    Raises:
+        RuntimeError: If any check fails.
+    """
+    # Verify database file was created
+    if not db_path.exists():
+        raise RuntimeError(f"Database file was not created at {db_path}")
+
+    logger.debug(f"Database file exists: {db_path}")
+
+    # Verify tables exist by querying sqlite_master
+    cursor = await db.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='queue'"
+    )
+    result = await cursor.fetchone()
+
+    if not result:
+        raise RuntimeError("Queue table was not created successfully")
+
+    logger.debug("Queue table verified in schema")
+
+    # Verify we can read from the table (basic connectivity test)
+    cursor = await db.execute("SELECT COUNT(*) FROM queue")
+    count = await cursor.fetchone()
+
+    logger.debug(f"Database read test successful (current queue items: {count[0]})")
+
+    # Verify we can write to the database (test with a transaction)
+    await db.execute("BEGIN")
+    await db.execute("ROLLBACK")
+
+    logger.debug("Database write test successful")
+
+
 async def init_db() -> None:
     """
     Initialize the database by creating tables if they don't exist.
-    Performs validation checks to ensure database is properly set up.
+    With DEBUG logging enabled, also runs the _verify_db self-checks.
     Should be called on application startup.
 
     Raises:
@@ -92,57 +198,96 @@ async def init_db() -> None:
     # Create database and tables
     try:
         async with aiosqlite.connect(db_path) as db:
+            # WAL lets readers (SSE broadcasts, playout) and a writer coexist.
+            # The mode is stored in the database file, so setting it once here
+            # covers every later connection.
+            cursor = await db.execute("PRAGMA journal_mode = WAL")
+            journal_mode = (await cursor.fetchone())[0]
+            if journal_mode.lower() != "wal":
+                logger.warning(f"SQLite WAL unavailable, using {journal_mode} mode")
+
             # Create tables
             await db.execute(CREATE_QUEUE_TABLE)
             logger.debug("Queue table created/verified")
 
-            await db.execute(CREATE_QUEUE_INDEX)
-            logger.debug("Queue index created/verified")
-
             await db.commit()
 
             # Migrate away from any legacy UNIQUE(video_id) constraint.
             await _migrate_drop_unique_video_id(db)
 
-            # Verify database file was created
-            if not db_path.exists():
-                raise RuntimeError(f"Database file was not created at {db_path}")
+            # Indexes after the migration, which rebuilds the table without them
+            await db.execute(CREATE_QUEUE_INDEX)
+            await db.execute(CREATE_ACTIVE_QUEUE_INDEX)
+            await db.execute(CREATE_PLAYING_INDEX)
+            await db.commit()
+            logger.debug("Queue indexes created/verified")
 
-            logger.debug(f"Database file exists: {db_path}")
+            # Optional self-checks (see _verify_db)
+            if logger.isEnabledFor(logging.DEBUG):
+                await _verify_db(db, db_path)
 
-            # Verify tables exist by querying sqlite_master
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='queue'"
-            )
-            result = await cursor.fetchone()
+    except aiosqlite.Error as e:
+        raise RuntimeError(f"Database initialization failed: {e}") from e
+    except Exception as e:
+        raise RuntimeError(
+            f"Unexpected error during database initialization: {e}"
+        ) from e
 
-            if not result:
-                raise RuntimeError("Queue table was not created successfully")
+    logger.info("Database initialization complete")
 
-            logger.debug("Queue table verified in schema")
 
-            # Verify we can read from the table (basic connectivity test)
-            cursor = await db.execute("SELECT COUNT(*) FROM queue")
-            count = await cursor.fetchone()
+# Per-connection tuning. WAL itself is persistent (set once in init_db); these
+# are not and must be applied to every connection. synchronous=NORMAL is the
+# recommended pairing for WAL: commits skip the fsync, which happens at
+# checkpoint instead (a power cut can lose the last commit, never corrupt).
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",  # KiB (negative), i.e. ~20 MB page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MB memory-mapped reads
+)
 
-            logger.debug(
-                f"Database read test successful (current queue items: {count[0]})"
-            )
 
-            # Verify we can write to the database (test with a transaction)
-            await db.execute("BEGIN")
-            await db.execute("ROLLBACK")
+async def _configure_connection(db: aiosqlite.Connection) -> None:
+    """Apply the per-connection PRAGMAs and row factory.
 
-            logger.debug("Database write test successful")
+    busy_timeout makes a contended writer wait up to 5s instead of failing
+    immediately with "database is locked". foreign_keys for integrity,
+    row_factory for dict-like access. See CONNECTION_PRAGMAS for the rest.
 
-    except aiosqlite.Error as e:
-        raise RuntimeError(f"Database initialization failed: {e}") from e
-    except Exception as e:
-        raise RuntimeError(
-            f"Unexpected error during database initialization: {e}"
-        ) from e
+    Args:
+        db: A freshly opened aiosqlite connection.
+    """
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+    db.row_factory = aiosqlite.Row
+
+
+async def open_db() -> None:
+    """Open the shared app-lifetime connection. Called once from the lifespan.
+
+    Must run after init_db(). Idempotent: a second call keeps the open one.
+    """
+    global _connection
+    if _connection is not None:
+        return
+    db = await aiosqlite.connect(
+        settings.get_db_path(), cached_statements=STATEMENT_CACHE_SIZE
+    )
+    await _configure_connection(db)
+    _connection = db
+    logger.info("Shared database connection opened")
 
-    logger.info("Database initialization complete and verified")
+
+async def close_db() -> None:
+    """Close the shared connection (lifespan shutdown). Safe if never opened."""
+    global _connection
+    db, _connection = _connection, None
+    if db is not None:
+        await db.close()
+        logger.info("Shared database connection closed")
 
 
 @asynccontextmanager
@@ -150,22 +295,23 @@ async def get_db() -> AsyncGenerator[aiosqlite.Connection, None]:
     """
     Async context manager for database connections.
 
+    Yields the shared connection opened by open_db(). Before that (or after
+    close_db()) - e.g. in unit tests that never run the lifespan - it falls
+    back to a short-lived connection that is closed on exit.
+
     Usage:
         async with get_db() as db:
             cursor = await db.execute("SELECT * FROM queue")
             rows = await cursor.fetchall()
     """
-    db_path = settings.get_db_path()
-    db = await aiosqlite.connect(db_path)
-
-    # WAL lets a reader and a writer coexist; busy_timeout makes a contended
-    # writer wait up to 5s instead of failing immediately with "database is
-    # locked". Both pragmas are per-connection. foreign_keys for integrity,
-    # row_factory for dict-like access.
-    await db.execute("PRAGMA journal_mode = WAL")
-    await db.execute("PRAGMA busy_timeout = 5000")
-    await db.execute("PRAGMA foreign_keys = ON")
-    db.row_factory = aiosqlite.Row
+    if _connection is not None:
+        yield _connection
+        return
+
+    db = await aiosqlite.connect(
+        settings.get_db_path(), cached_statements=STATEMENT_CACHE_SIZE
+    )
+    await _configure_connection(db)
 
     try:
         yield db
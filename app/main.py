@@ -7,33 +7,52 @@ queue updates via Server-Sent Events.
 """
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import os
 import sys
 import shutil
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
+from queue import SimpleQueue
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from pydantic import BaseModel
 
 from app.config import settings
-from app.database import init_db
+from app.database import close_db, init_db, open_db
+from app.services.download import download_service
 from app.services.queue_manager import queue_manager
 from app.routes import auth, search, queue, admin
 
-# Configure logging (will be reconfigured with LOG_LEVEL setting during startup)
+# Configure logging (will be reconfigured with LOG_LEVEL setting during startup).
+# Records are queued and written to stdout by a listener thread, so a slow
+# stdout (container log driver, terminal) never blocks the event loop.
+_log_queue: SimpleQueue = SimpleQueue()
+_log_stream_handler = logging.StreamHandler(sys.stdout)
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
 logging.basicConfig(
     level=logging.INFO,  # Default level before settings are fully loaded
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
+_log_listener.start()
+# Flush anything still queued when the process exits.
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+# Rule line framing the startup configuration banner
+_BANNER = "=" * 60
+
 
-# Scheduler for cleanup jobs
-scheduler = AsyncIOScheduler()
+# Periodic cleanup task, started by the lifespan when cleanup is enabled
+_cleanup_task: asyncio.Task | None = None
 
 
 async def cleanup_old_queue_items():
@@ -57,22 +76,64 @@ async def cleanup_old_queue_items():
         logger.error(f"Error in cleanup job: {e}", exc_info=True)
 
 
+async def _cleanup_loop(interval_hours: float):
+    """
+    Run cleanup_old_queue_items every interval_hours until cancelled.
+
+    Like an interval trigger, the first run happens one interval after startup.
+
+    Args:
+        interval_hours: Hours to sleep between cleanup runs
+    """
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        await cleanup_old_queue_items()
+
+
+def _resolve_ffmpeg() -> str | None:
+    """
+    Locate the ffmpeg binary for yt-dlp.
+
+    An explicit FFMPEG_PATH is used only if it names an executable file;
+    otherwise (or when unset) PATH is searched.
+
+    Returns:
+        Path to ffmpeg, or None if it cannot be found
+    """
+    path = settings.ffmpeg_path
+    if path:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+        logger.warning(
+            f"FFMPEG_PATH {path!r} is not an executable file, searching PATH instead"
+        )
+    return shutil.which("ffmpeg")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for startup and shutdown events.
     """
+    global _cleanup_task
+
     # Startup
     logger.info("Starting Karaoke Jukebox application...")
 
-    # Configure logging level from settings
-    log_level = getattr(logging, settings.log_level)
-    logging.getLogger().setLevel(log_level)
+    # uvicorn[standard] ships uvloop and httptools and picks them automatically;
+    # log which loop is actually running so a fallback to asyncio is visible.
+    loop_type = type(asyncio.get_running_loop())
+    logger.info(f"Event loop: {loop_type.__module__}.{loop_type.__name__}")
+
+    # Configure logging level from settings. The validator guarantees a
+    # canonical level name, which setLevel accepts directly.
+    logging.getLogger().setLevel(settings.log_level)
     logger.info(f"Log level set to: {settings.log_level}")
 
     # Initialize database
     logger.info("Initializing database...")
     await init_db()
+    await open_db()
     logger.info("Database initialized")
 
     # Reset orphaned queue items (items stuck in 'playing' status from previous run)
@@ -93,64 +154,66 @@ async def lifespan(app: FastAPI):
     settings.get_videos_dir().mkdir(parents=True, exist_ok=True)
     logger.info(f"Data directory: {settings.data_dir}")
 
-    # Check for ffmpeg (required for video downloads)
-    ffmpeg_path = shutil.which("ffmpeg")
+    # Check for ffmpeg (required for video downloads). The resolved location is
+    # handed to yt-dlp so it does not search again on every download.
+    ffmpeg_path = _resolve_ffmpeg()
+    app.state.ffmpeg_path = ffmpeg_path
+    download_service.ffmpeg_location = ffmpeg_path
     if ffmpeg_path:
         logger.info(f"ffmpeg found: {ffmpeg_path}")
     else:
-        logger.warning("ffmpeg NOT FOUND! Video downloads will fail.")
-        logger.warning("   Install ffmpeg: https://ffmpeg.org/download.html")
-        logger.warning("   macOS: brew install ffmpeg")
-        logger.warning("   Ubuntu: apt-get install ffmpeg")
+        logger.warning(
+            "ffmpeg NOT FOUND! Video downloads will fail.\n"
+            "   Install ffmpeg: https://ffmpeg.org/download.html\n"
+            "   macOS: brew install ffmpeg\n"
+            "   Ubuntu: apt-get install ffmpeg"
+        )
 
-    # Check and log server configuration for Chromecast
+    # Check and log server configuration for Chromecast. The banner is
+    # assembled first and emitted as a single record.
     if settings.player_backend == "chromecast":
-        logger.info("=" * 60)
-        logger.info("SERVER CONFIGURATION FOR CHROMECAST")
-        logger.info("=" * 60)
-
         if settings.is_docker():
-            logger.info("Environment: Docker container detected")
-            if settings.server_host:
-                logger.info(
-                    f"Server Host: {settings.server_host} (from SERVER_HOST env var)"
-                )
-            else:
-                logger.error("SERVER_HOST is NOT SET!")
-                logger.error("   Chromecast will NOT be able to access videos!")
-                logger.error("   Set SERVER_HOST to your Docker host's IP address")
-                logger.error("   Example: SERVER_HOST=192.168.1.100")
+            environment = "Docker container detected"
         else:
-            logger.info("Environment: Development (not Docker)")
-            if settings.server_host:
-                logger.info(
-                    f"Server Host: {settings.server_host} (from SERVER_HOST env var)"
-                )
-            else:
-                detected_host = settings.get_local_ip()
-                logger.info(f"Server Host: {detected_host} (auto-detected)")
-
-        logger.info(f"Server Port: {settings.server_port}")
-
-        # Show example Chromecast URL
+            environment = "Development (not Docker)"
+
+        if settings.server_host:
+            host_line = f"{settings.server_host} (from SERVER_HOST env var)"
+        elif settings.is_docker():
+            host_line = "NOT SET"
+            logger.error(
+                "SERVER_HOST is NOT SET!\n"
+                "   Chromecast will NOT be able to access videos!\n"
+                "   Set SERVER_HOST to your Docker host's IP address\n"
+                "   Example: SERVER_HOST=192.168.1.100"
+            )
+        else:
+            host_line = f"{settings.get_local_ip()} (auto-detected)"
+
+        # Freeze the URL prefix so per-song URL generation is a concatenation
+        settings.freeze_video_url_prefix()
         example_url = settings.get_video_url("EXAMPLE_VIDEO_ID")
-        logger.info(f"Example Chromecast URL: {example_url}")
-        logger.info("Chromecasts must be able to reach this URL on your network")
-        logger.info("=" * 60)
+        logger.info(
+            f"{_BANNER}\n"
+            "SERVER CONFIGURATION FOR CHROMECAST\n"
+            f"{_BANNER}\n"
+            f"Environment: {environment}\n"
+            f"Server Host: {host_line}\n"
+            f"Server Port: {settings.server_port}\n"
+            f"Example Chromecast URL: {example_url}\n"
+            "Chromecasts must be able to reach this URL on your network\n"
+            f"{_BANNER}"
+        )
     else:
         logger.info("Playback backend: mpv (local video output)")
 
-    # Start cleanup scheduler
+    # Start cleanup loop
     if settings.queue_cleanup_interval_hours > 0:
-        scheduler.add_job(
-            cleanup_old_queue_items,
-            "interval",
-            hours=settings.queue_cleanup_interval_hours,
-            id="cleanup_queue",
+        _cleanup_task = asyncio.create_task(
+            _cleanup_loop(settings.queue_cleanup_interval_hours)
         )
-        scheduler.start()
         logger.info(
-            f"Cleanup scheduler started "
+            f"Cleanup loop started "
             f"(every {settings.queue_cleanup_interval_hours} hours, "
             f"threshold: {settings.queue_cleanup_threshold_hours} hours)"
         )
@@ -162,16 +225,27 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application...")
 
-    # Stop scheduler
-    if scheduler.running:
-        scheduler.shutdown()
-        logger.info("Cleanup scheduler stopped")
+    # Stop cleanup loop
+    if _cleanup_task is not None:
+        _cleanup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _cleanup_task
+        _cleanup_task = None
+        logger.info("Cleanup loop stopped")
 
     # Stop playback and join the playout thread for a clean exit
     from app.services.playout import playout_service
 
     playout_service.shutdown()
 
+    download_service.shutdown()
+
+    # After the playout thread is joined, whose writes schedule broadcasts.
+    await queue_manager.shutdown()
+
+    # After the playout thread is joined: it reaches the DB via this loop.
+    await close_db()
+
     logger.info("Application shutdown complete")
 
 
@@ -193,11 +267,14 @@ app.include_router(admin.router)
 
 # Mount static files
 # Videos directory (for Chromecast playback)
+# Mounted unconditionally: the lifespan creates the directory, so skip the
+# import-time stat and StaticFiles' own directory check.
 videos_path = settings.get_videos_dir()
-if videos_path.exists():
-    app.mount("/data/videos", StaticFiles(directory=str(videos_path)), name="videos")
-else:
-    logger.warning(f"Videos directory does not exist: {videos_path}")
+app.mount(
+    "/data/videos",
+    StaticFiles(directory=str(videos_path), check_dir=False),
+    name="videos",
+)
 
 # Static assets (CSS, JS)
 static_path = Path("app/static")
@@ -213,17 +290,40 @@ async def root():
     pass  # auth.router handles "/"
 
 
+# Uptime probes poll /health every few seconds; serve the queue size from a
+# short-lived cache so they do not each cost a COUNT(*) query.
+HEALTH_CACHE_TTL = 1.0  # seconds
+_health_cache = {"t": float("-inf"), "queue_size": 0}
+
+
+class HealthStatus(BaseModel):
+    """Body of the /health response.
+
+    Declaring the return type lets FastAPI serialize the response straight to
+    JSON bytes through pydantic-core instead of the stdlib json encoder.
+    """
+
+    status: str
+    queue_size: int
+    is_playing: bool
+
+
 # Health check endpoint
 @app.get("/health")
-async def health_check():
+async def health_check() -> HealthStatus:
     """Health check endpoint for monitoring."""
     from app.services.playout import playout_service
 
-    return {
-        "status": "healthy",
-        "queue_size": await queue_manager.get_queue_size(),
-        "is_playing": playout_service.is_playing,
-    }
+    now = time.monotonic()
+    if now - _health_cache["t"] >= HEALTH_CACHE_TTL:
+        _health_cache["queue_size"] = await queue_manager.get_queue_size()
+        _health_cache["t"] = now
+
+    return HealthStatus(
+        status="healthy",
+        queue_size=_health_cache["queue_size"],
+        is_playing=playout_service.is_playing,
+    )
 
 
 if __name__ == "__main__":
@@ -3,13 +3,18 @@ Admin routes for playback control and queue management.
 All routes require admin authentication.
 """
 
-from fastapi import APIRouter, Request, Form, Depends
+import asyncio
+import secrets
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Request, Response, Form, Depends
+from pydantic import BaseModel
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from app.config import settings
 from app.routes.auth import require_admin
 from app.services.playout import playout_service
 from app.services.queue_manager import queue_manager
+from app.templating import templates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,16 +23,14 @@ router = APIRouter(
     prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)]
 )
 
-templates = Jinja2Templates(directory="app/templates")
-
 
 @router.get("/", response_class=HTMLResponse)
-async def admin_page(request: Request):
+async def admin_page(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Render the admin control panel.
     Requires admin authentication.
     """
-    username, is_admin = require_admin(request)
+    username, is_admin = user_data
 
     # Get initial queue state for page load
     # (SSE will then keep it updated in real-time)
@@ -51,14 +54,14 @@ async def admin_page(request: Request):
 
 
 @router.get("/devices/scan")
-async def scan_devices(request: Request):
+async def scan_devices(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Scan for available Chromecast devices on the network.
 
     Returns:
         JSON with list of discovered devices
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Device scan initiated by {username}")
 
     try:
@@ -80,14 +83,18 @@ async def scan_devices(request: Request):
 
 
 @router.post("/devices/select")
-async def select_device(request: Request, device_uuid: str = Form(...)):
+async def select_device(
+    request: Request,
+    device_uuid: str = Form(...),
+    user_data: tuple = Depends(require_admin),
+):
     """
     Select a Chromecast device for playback.
 
     Args:
         device_uuid: UUID of the device to select
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Device selection by {username}: {device_uuid}")
 
     success = playout_service.select_device(device_uuid)
@@ -110,17 +117,15 @@ async def list_mpv_outputs(request: Request):
     Returns:
         JSON {"video": [...], "audio": [...]}; 404 on other backends.
     """
-    require_admin(request)
-
     if settings.player_backend != "mpv":
         return JSONResponse({"video": [], "audio": []}, status_code=404)
 
-    return JSONResponse(
-        {
-            "video": playout_service.list_video_outputs(),
-            "audio": playout_service.list_audio_outputs(),
-        }
-    )
+    # The audio list is an mpv IPC round-trip and the video list walks sysfs;
+    # run both off the event loop.
+    video_outputs = await asyncio.to_thread(playout_service.list_video_outputs)
+    audio_outputs = await asyncio.to_thread(playout_service.list_audio_outputs)
+
+    return JSONResponse({"video": video_outputs, "audio": audio_outputs})
 
 
 @router.post("/mpv/output/select")
@@ -129,6 +134,7 @@ async def select_mpv_output(
     drm_device: str = Form(...),
     drm_connector: str = Form(...),
     audio_device: str = Form(...),
+    user_data: tuple = Depends(require_admin),
 ):
     """
     Select the local video/audio output (mpv backend only).
@@ -138,7 +144,7 @@ async def select_mpv_output(
         drm_connector: DRM connector name, e.g. "HDMI-A-1".
         audio_device: mpv audio-device string.
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
 
     if settings.player_backend != "mpv":
         return JSONResponse(
@@ -153,8 +159,10 @@ async def select_mpv_output(
         f"mpv output selection by {username}: "
         f"{drm_device} {drm_connector} {audio_device}"
     )
-    success, message = playout_service.select_output(
-        drm_device, drm_connector, audio_device
+    # Tearing down and rebuilding the mpv handle can take seconds; keep it
+    # off the event loop so SSE streams and other requests are not stalled.
+    success, message = await asyncio.to_thread(
+        playout_service.select_output, drm_device, drm_connector, audio_device
     )
 
     if success:
@@ -163,7 +171,7 @@ async def select_mpv_output(
 
 
 @router.post("/playback/start")
-async def start_playback(request: Request):
+async def start_playback(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Start playback from the queue on the selected Chromecast device.
 
@@ -171,7 +179,7 @@ async def start_playback(request: Request):
     - Chromecast device to be selected
     - Queue to have at least one item
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Playback start requested by {username}")
 
     # Check if queue has items
@@ -191,11 +199,11 @@ async def start_playback(request: Request):
 
 
 @router.post("/playback/stop")
-async def stop_playback(request: Request):
+async def stop_playback(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Stop playback on the Chromecast device.
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Playback stop requested by {username}")
 
     result = playout_service.stop_playback()
@@ -204,11 +212,11 @@ async def stop_playback(request: Request):
 
 
 @router.post("/playback/skip")
-async def skip_current(request: Request):
+async def skip_current(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Skip the currently playing song and advance to the next.
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Skip requested by {username}")
 
     result = playout_service.skip_current()
@@ -216,38 +224,67 @@ async def skip_current(request: Request):
     return JSONResponse(result)
 
 
-@router.get("/status")
-async def get_status(request: Request):
+# Distinguishes this process's status ETags from a previous run's, whose queue
+# version counter started from the same value.
+_STATUS_ETAG_PREFIX = secrets.token_hex(4)
+
+
+class PlaybackStatus(BaseModel):
+    """Body of the /admin/status response, polled by the admin page.
+
+    A declared return type lets FastAPI serialize straight to JSON bytes via
+    pydantic-core rather than jsonable_encoder + the stdlib json encoder.
+    """
+
+    is_playing: bool
+    selected_device_uuid: Optional[str]
+    queue_size: int
+    currently_playing: Optional[Dict[str, Any]]
+
+
+@router.get("/status", response_model=PlaybackStatus)
+async def get_status(request: Request, response: Response):
     """
     Get current playback status.
 
+    The admin page polls this every few seconds, so it is served with an
+    ETag built from the queue version and the playback state. A poll that
+    finds nothing changed gets an empty 304 without touching the database.
+
     Returns:
-        JSON with playback state, selected device, and queue info
+        Playback state, selected device, and queue info
     """
     is_playing = playout_service.is_playing
     selected_device = playout_service.selected_device_uuid
-    queue_size = await queue_manager.get_queue_size()
-    currently_playing = await queue_manager.get_currently_playing()
+    etag = (
+        f'"{_STATUS_ETAG_PREFIX}-{queue_manager.version}-'
+        f'{int(is_playing)}-{selected_device or ""}"'
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-    return JSONResponse(
-        {
-            "is_playing": is_playing,
-            "selected_device_uuid": selected_device,
-            "queue_size": queue_size,
-            "currently_playing": currently_playing,
-        }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return PlaybackStatus(
+        is_playing=is_playing,
+        selected_device_uuid=selected_device,
+        queue_size=await queue_manager.get_queue_size(),
+        currently_playing=await queue_manager.get_currently_playing(),
     )
 
 
 @router.delete("/queue/{queue_id}")
-async def admin_delete_queue_item(request: Request, queue_id: int):
+async def admin_delete_queue_item(
+    request: Request, queue_id: int, user_data: tuple = Depends(require_admin)
+):
     """
     Admin can delete any queue item (no ownership check).
 
     Args:
         queue_id: ID of queue item to delete
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Admin queue delete by {username}: item {queue_id}")
 
     try:
@@ -270,11 +307,11 @@ async def admin_delete_queue_item(request: Request, queue_id: int):
 
 
 @router.post("/queue/clear")
-async def clear_queue(request: Request):
+async def clear_queue(request: Request, user_data: tuple = Depends(require_admin)):
     """
     Clear all items from the queue.
     """
-    username, _ = require_admin(request)
+    username, _ = user_data
     logger.info(f"Queue clear requested by {username}")
 
     try:
@@ -5,23 +5,21 @@ Uses cookie-based sessions with itsdangerous for signing.
 
 import logging
 import secrets
-from typing import Optional, Tuple
+import time
+from typing import Dict, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from itsdangerous import BadData, URLSafeTimedSerializer
 
 from app.config import settings
 from app.rate_limit import RateLimiter
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Authentication"])
 
-# Jinja2 templates
-templates = Jinja2Templates(directory="app/templates")
-
 # Session serializer. URLSafeTimedSerializer embeds a timestamp in the token so
 # the signature itself expires - a captured cookie cannot be replayed forever.
 serializer = URLSafeTimedSerializer(settings.secret_key)
@@ -33,6 +31,13 @@ SESSION_COOKIE_NAME = "karaoke_session"
 # against the token's embedded timestamp, not just the browser cookie max-age.
 SESSION_MAX_AGE = 86400
 
+# Verified sessions keyed by the raw cookie string, so repeat requests from the
+# same browser (HTMX partials, SSE reconnects) skip the HMAC check. Each entry
+# keeps the token's signing time so SESSION_MAX_AGE is still enforced on every
+# hit. Oldest entries are evicted first once the cache is full.
+SESSION_CACHE_SIZE = 1024
+_session_cache: Dict[str, Tuple[dict, int]] = {}
+
 # Rate limit admin password attempts per client IP to defeat brute forcing.
 _admin_login_limiter = RateLimiter(max_events=5, window_seconds=300)
 
@@ -56,13 +61,30 @@ def decode_session(session_string: str) -> Optional[dict]:
     Returns None for any invalid token: bad signature, tampered payload, or an
     expired timestamp (older than SESSION_MAX_AGE). Catching BadData covers all
     of these because it is the base class for every itsdangerous failure.
+
+    Only verified tokens are cached, so a garbage cookie cannot fill the cache.
+    The returned dict is shared with the cache and must not be mutated.
     """
+    cached = _session_cache.get(session_string)
+    if cached is not None:
+        data, signed_at = cached
+        if 0 <= int(time.time()) - signed_at <= SESSION_MAX_AGE:
+            return data
+        _session_cache.pop(session_string, None)
+
     try:
-        return serializer.loads(session_string, max_age=SESSION_MAX_AGE)
+        data, signed_at = serializer.loads(
+            session_string, max_age=SESSION_MAX_AGE, return_timestamp=True
+        )
     except BadData:
         logger.warning("Rejected invalid or expired session cookie")
         return None
 
+    if len(_session_cache) >= SESSION_CACHE_SIZE:
+        del _session_cache[next(iter(_session_cache))]
+    _session_cache[session_string] = (data, int(signed_at.timestamp()))
+    return data
+
 
 def get_session_from_cookie(request: Request) -> Optional[dict]:
     """Extract and validate session from request cookies."""
@@ -79,10 +101,19 @@ def get_session_user(request: Request) -> Tuple[Optional[str], bool]:
     Returns:
         Tuple of (username, is_admin) or (None, False) if no session
     """
+    # Memoized on the request so the router guard, handler dependencies and
+    # direct calls share one cookie parse and lookup.
+    user = getattr(request.state, "session_user", None)
+    if user is not None:
+        return user
+
     session = get_session_from_cookie(request)
     if not session:
-        return None, False
-    return session.get("username"), session.get("is_admin", False)
+        user = (None, False)
+    else:
+        user = (session.get("username"), session.get("is_admin", False))
+    request.state.session_user = user
+    return user
 
 
 def _redirect_to_login(url: str) -> HTTPException:
@@ -96,10 +127,13 @@ def _redirect_to_login(url: str) -> HTTPException:
     return HTTPException(status_code=303, headers={"Location": url})
 
 
-def require_session(request: Request) -> Tuple[str, bool]:
+async def require_session(request: Request) -> Tuple[str, bool]:
     """
     Dependency that requires a valid session.
 
+    Declared async so FastAPI calls it on the event loop; a plain def
+    dependency is dispatched to the threadpool on every request.
+
     Returns:
         Tuple of (username, is_admin)
 
@@ -112,10 +146,12 @@ def require_session(request: Request) -> Tuple[str, bool]:
     return username, is_admin
 
 
-def require_admin(request: Request) -> Tuple[str, bool]:
+async def require_admin(request: Request) -> Tuple[str, bool]:
     """
     Dependency that requires admin session.
 
+    Async for the same reason as require_session.
+
     Returns:
         Tuple of (username, is_admin=True)
 
@@ -183,7 +219,11 @@ async def login(
             )
 
         # Constant-time comparison avoids leaking the password via timing.
-        if not secrets.compare_digest(password, settings.admin_password):
+        # Compared as UTF-8 bytes: compare_digest rejects non-ASCII str input
+        # with a TypeError, which would turn a typo into a 500.
+        if not secrets.compare_digest(
+            password.encode("utf-8"), settings.admin_password.encode("utf-8")
+        ):
             logger.warning(f"Failed admin login attempt from {client_ip}")
             return RedirectResponse(
                 url="/?error=Invalid+admin+password", status_code=303
@@ -29,9 +29,9 @@ async def queue_sse(request: Request):
     # Get user session info
     username, is_admin = get_session_user(request)
     if username:
-        logger.info(f"SSE connection from: {username} (admin: {is_admin})")
+        logger.debug(f"SSE connection from: {username} (admin: {is_admin})")
     else:
-        logger.info("SSE connection from anonymous user")
+        logger.debug("SSE connection from anonymous user")
 
     async def event_generator():
         """Generate SSE events."""
@@ -4,30 +4,53 @@ Handles YouTube search, video queueing, and the main app page.
 """
 
 import logging
+from functools import lru_cache
 
 from fastapi import APIRouter, Request, Form, BackgroundTasks, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
 from app.rate_limit import RateLimiter
 from app.routes.auth import require_session, get_session_user
 from app.services.download import download_service, DownloadError
 from app.services.queue_manager import queue_manager
 from app.services.youtube import youtube_service, YouTubeError
+from app.templating import templates
 from app.validators import is_valid_video_id
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Search & Queue"])
 
-templates = Jinja2Templates(directory="app/templates")
-
 # Per-user rate limits. Keyed by username (falling back to client IP for
 # anonymous callers). Search guards YouTube API quota; queue guards downloads.
 _search_limiter = RateLimiter(max_events=30, window_seconds=60)
 _queue_limiter = RateLimiter(max_events=20, window_seconds=60)
 
 
+@lru_cache(maxsize=32)
+def _search_error_body(message: str) -> bytes:
+    """Render the search-results error partial for `message`, once.
+
+    Error partials carry no per-request data, so the rendered bytes are
+    memoized and reused on every later occurrence of the same message.
+
+    Args:
+        message: User-facing error message.
+
+    Returns:
+        The rendered partial, UTF-8 encoded.
+    """
+    html = templates.get_template("partials/search_results.html").render(
+        {"results": [], "error": message}
+    )
+    return html.encode("utf-8")
+
+
+def _search_error(message: str) -> HTMLResponse:
+    """Return the (memoized) search-results error partial as a response."""
+    return HTMLResponse(_search_error_body(message))
+
+
 def _rate_limit_key(request: Request, username: str | None = None) -> str:
     """Build a rate-limit key from the username or the client IP."""
     if username:
@@ -75,20 +98,11 @@ async def search(request: Request, query: str = Form(...)):
     username, is_admin = get_session_user(request)
 
     if not query.strip():
-        return templates.TemplateResponse(
-            request,
-            "partials/search_results.html",
-            {"results": [], "error": "Please enter a search query"},
-        )
+        return _search_error("Please enter a search query")
 
     if not _search_limiter.allow(_rate_limit_key(request, username)):
-        return templates.TemplateResponse(
-            request,
-            "partials/search_results.html",
-            {
-                "results": [],
-                "error": "Too many searches. Please slow down and try again shortly.",
-            },
+        return _search_error(
+            "Too many searches. Please slow down and try again shortly."
         )
 
     try:
@@ -111,21 +125,10 @@ async def search(request: Request, query: str = Form(...)):
         )
 
     except YouTubeError as e:
-        return templates.TemplateResponse(
-            request,
-            "partials/search_results.html",
-            {"results": [], "error": e.user_message, "is_admin": is_admin},
-        )
+        return _search_error(e.user_message)
     except Exception as e:
         logger.error(f"Search error: {e}")
-        return templates.TemplateResponse(
-            request,
-            "partials/search_results.html",
-            {
-                "results": [],
-                "error": "Search failed. Please try again.",
-            },
-        )
+        return _search_error("Search failed. Please try again.")
 
 
 @router.post("/queue/{video_id}", response_class=HTMLResponse)
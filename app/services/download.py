@@ -5,7 +5,10 @@ Downloads YouTube videos to local storage for Chromecast playback.
 
 import asyncio
 import logging
-from typing import Any, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, Optional, Set, Tuple
 
 import yt_dlp
 
@@ -14,6 +17,41 @@ from app.validators import is_valid_video_id
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on yt-dlp downloads running at once. A burst of queue requests
+# for different songs would otherwise start one yt-dlp thread each and compete
+# for bandwidth, disk and the default thread pool; extra requests wait their
+# turn instead.
+MAX_CONCURRENT_DOWNLOADS = 3
+
+# yt-dlp options for Chromecast-compatible video, shared by every download
+# (only outtmpl and ffmpeg_location are added per call).
+# Chromecast supports: H.264 (avc1), VP8, VP9
+# Chromecast does NOT support: AV1 (av01)
+YDL_BASE_OPTS: Dict[str, Any] = {
+    # Format selection:
+    # 1. Prefer H.264 (avc1) video with AAC audio
+    # 2. Fallback to VP9/VP8 with compatible audio
+    # 3. Explicitly exclude AV1 codec (vcodec!=av01)
+    # 4. Merge to MP4 container
+    "format": (
+        "bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[ext=m4a]/"  # H.264 + AAC
+        "bestvideo[vcodec^=avc1]+bestaudio/"  # H.264 + any audio
+        "bestvideo[vcodec^=vp9][ext=webm]+bestaudio[ext=webm]/"  # VP9 + webm audio
+        "bestvideo[vcodec^=vp09]+bestaudio/"  # VP9 + any audio
+        "bestvideo[vcodec!=av01][ext=mp4]+bestaudio/"  # Any non-AV1 MP4
+        "bestvideo[vcodec!=av01]+bestaudio/"  # Any non-AV1 video
+        "best[vcodec!=av01]"  # Fallback: best non-AV1
+    ),
+    "merge_output_format": "mp4",
+    "quiet": False,
+    "no_warnings": False,
+    "extract_flat": False,
+    "ignoreerrors": False,
+    "nocheckcertificate": False,
+    # Progress hooks could be added here for future UI updates
+    # 'progress_hooks': [self._progress_hook],
+}
+
 
 class DownloadError(Exception):
     """Raised when video download fails."""
@@ -33,6 +71,39 @@ class VideoDownloadService:
         # concurrently into the same output file. The guard protects the dict.
         self._video_locks: Dict[str, asyncio.Lock] = {}
         self._locks_guard = asyncio.Lock()
+        # Admission control across different videos (see MAX_CONCURRENT_DOWNLOADS).
+        self._download_slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        # yt-dlp runs on its own threads so minutes-long downloads never tie up
+        # the default executor that asyncio.to_thread shares with short calls.
+        # Created on first use and dropped by shutdown(), so the service works
+        # again after a later startup (see _get_executor).
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # ffmpeg binary resolved once at startup (FFMPEG_PATH or PATH lookup).
+        # None lets yt-dlp search PATH itself.
+        self.ffmpeg_location: Optional[str] = settings.ffmpeg_path or None
+        # Video ids already confirmed on disk, so repeat checks for popular
+        # songs skip the stat. Seeded from one directory scan, then extended
+        # as downloads land. Misses still consult the filesystem; anything
+        # that deletes a video file must call forget(). Only touched from the
+        # event loop, so it needs no lock.
+        self._present: Set[str] = self._scan_videos_dir()
+        # Idle YoutubeDL instances as (options key, instance). Reusing them
+        # keeps extractor setup and yt-dlp's in-memory player/signature caches
+        # across songs. The download slots bound how many are ever in use.
+        self._ydl_pool: SimpleQueue[Tuple[str, yt_dlp.YoutubeDL]] = SimpleQueue()
+
+    def _scan_videos_dir(self) -> Set[str]:
+        """Return the ids of the non-empty .mp4 files already downloaded."""
+        present = set()
+        with os.scandir(self.videos_dir) as entries:
+            for entry in entries:
+                if (
+                    entry.name.endswith(".mp4")
+                    and entry.is_file()
+                    and entry.stat().st_size > 0
+                ):
+                    present.add(entry.name.removesuffix(".mp4"))
+        return present
 
     async def _get_video_lock(self, video_id: str) -> asyncio.Lock:
         """Return a per-video_id asyncio.Lock, creating it on first use."""
@@ -53,8 +124,25 @@ class VideoDownloadService:
         Returns:
             True if the video file exists, False otherwise
         """
-        video_path = settings.get_video_path(video_id)
-        return video_path.exists() and video_path.stat().st_size > 0
+        if video_id in self._present:
+            return True
+        try:
+            size = settings.get_video_path(video_id).stat().st_size
+        except FileNotFoundError:
+            return False
+        if size > 0:
+            self._present.add(video_id)
+            return True
+        return False
+
+    def forget(self, video_id: str) -> None:
+        """
+        Drop a video from the on-disk cache after its file has been deleted.
+
+        Args:
+            video_id: YouTube video ID whose file was removed
+        """
+        self._present.discard(video_id)
 
     async def download(self, video_id: str, title: str = "") -> Dict[str, Any]:
         """
@@ -93,7 +181,10 @@ class VideoDownloadService:
                     "message": "Video already downloaded",
                 }
 
-            return await self._download_locked(video_id, title, video_path)
+            # Take a download slot only once we know a download is needed, so
+            # callers waiting on an in-progress video never hold one.
+            async with self._download_slots:
+                return await self._download_locked(video_id, title, video_path)
 
     async def _download_locked(
         self, video_id: str, title: str, video_path
@@ -101,38 +192,18 @@ class VideoDownloadService:
         """Run the actual download. Caller must hold the per-video lock."""
         logger.info(f"Starting download: {video_id} - {title}")
 
-        # yt-dlp options for Chromecast-compatible video
-        # Chromecast supports: H.264 (avc1), VP8, VP9
-        # Chromecast does NOT support: AV1 (av01)
         ydl_opts = {
-            # Format selection:
-            # 1. Prefer H.264 (avc1) video with AAC audio
-            # 2. Fallback to VP9/VP8 with compatible audio
-            # 3. Explicitly exclude AV1 codec (vcodec!=av01)
-            # 4. Merge to MP4 container
-            "format": (
-                "bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[ext=m4a]/"  # H.264 + AAC
-                "bestvideo[vcodec^=avc1]+bestaudio/"  # H.264 + any audio
-                "bestvideo[vcodec^=vp9][ext=webm]+bestaudio[ext=webm]/"  # VP9 + webm audio
-                "bestvideo[vcodec^=vp09]+bestaudio/"  # VP9 + any audio
-                "bestvideo[vcodec!=av01][ext=mp4]+bestaudio/"  # Any non-AV1 MP4
-                "bestvideo[vcodec!=av01]+bestaudio/"  # Any non-AV1 video
-                "best[vcodec!=av01]"  # Fallback: best non-AV1
-            ),
+            **YDL_BASE_OPTS,
             "outtmpl": str(self.videos_dir / f"{video_id}.%(ext)s"),
-            "merge_output_format": "mp4",
-            "quiet": False,
-            "no_warnings": False,
-            "extract_flat": False,
-            "ignoreerrors": False,
-            "nocheckcertificate": False,
-            # Progress hooks could be added here for future UI updates
-            # 'progress_hooks': [self._progress_hook],
         }
+        if self.ffmpeg_location:
+            ydl_opts["ffmpeg_location"] = self.ffmpeg_location
 
         try:
-            # Run yt-dlp in thread pool to avoid blocking
-            await asyncio.to_thread(self._download_sync, video_id, ydl_opts)
+            # Run yt-dlp on the download threads to avoid blocking
+            await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), self._download_sync, video_id, ydl_opts
+            )
 
             # Verify download succeeded
             if not self.is_downloaded(video_id):
@@ -154,6 +225,7 @@ class VideoDownloadService:
             logger.error(f"Download failed for {video_id}: {error_msg}")
 
             # Clean up partial download if exists
+            self.forget(video_id)
             if video_path.exists():
                 try:
                     video_path.unlink()
@@ -193,8 +265,55 @@ class VideoDownloadService:
             Exception: If download fails
         """
         url = f"https://www.youtube.com/watch?v={video_id}"
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        outtmpl = ydl_opts["outtmpl"]
+        # Everything but the output path is the same for every download, so an
+        # idle instance built from the same options can be reused.
+        key = repr(sorted((k, v) for k, v in ydl_opts.items() if k != "outtmpl"))
+
+        ydl = None
+        while ydl is None:
+            try:
+                pooled_key, pooled = self._ydl_pool.get_nowait()
+            except Empty:
+                ydl = yt_dlp.YoutubeDL(ydl_opts)
+                break
+            if pooled_key == key:
+                ydl = pooled
+            else:
+                pooled.close()
+
+        try:
+            ydl.params["outtmpl"]["default"] = outtmpl
             ydl.download([url])
+        except BaseException:
+            # Don't hand a half-failed instance to the next download.
+            ydl.close()
+            raise
+        self._ydl_pool.put((key, ydl))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the download thread pool, creating it if needed."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="yt-dlp"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the download threads and close pooled YoutubeDL instances.
+
+        Does not wait for a download in progress; queued ones are cancelled.
+        The next download starts a fresh pool.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                _, ydl = self._ydl_pool.get_nowait()
+            except Empty:
+                break
+            ydl.close()
 
 
 # Global instance
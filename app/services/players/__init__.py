@@ -36,6 +36,10 @@ class Player(Protocol):
     session (the playout thread's connection). Backends without discoverable
     devices set supports_discovery = False and implement
     discover_devices/select_device as stubs returning [] / False.
+
+    Optional: a backend whose play() blocks on its own event may define
+    wake(), which the controller calls right after setting skip/stop so the
+    backend need not poll the two events on a short interval.
     """
 
     supports_discovery: bool
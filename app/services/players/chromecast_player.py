@@ -7,9 +7,9 @@ PlaybackOutcome. Queue policy (retry caps, item fate) lives in app/services/play
 Hard-won playback details preserved from the original implementation:
 - Use BUFFERED stream type (NOT "LIVE") for video files.
 - MUST wait for the media session before monitoring.
-- The status object is STALE immediately after session activation (it still holds the
-  previous video's state); Chromecast sends the first fresh update within ~100ms, so we
-  wait 500ms before trusting it.
+- The status object can be STALE when session activation is observed (it may still
+  hold the previous video's state), so we wait for the first status update pushed
+  after the load - up to STATUS_REFRESH_TIMEOUT (2s) - before trusting it.
 - idle_reason distinguishes completion types: FINISHED = success, ERROR = failure,
   INTERRUPTED/None = new media loading (keep waiting).
 """
@@ -19,15 +19,15 @@ import asyncio
 import logging
 import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 # 3rd party
 import pychromecast
 from pychromecast import CastInfo
+from pychromecast.controllers.media import MediaStatus, MediaStatusListener
 from pychromecast.discovery import AbstractCastListener, CastBrowser
 from zeroconf import Zeroconf
-from zeroconf.asyncio import AsyncZeroconf
 
 # project imports
 from app.config import settings
@@ -35,29 +35,108 @@ from app.services.players import MAX_SONG_DURATION, PlaybackOutcome
 
 logger = logging.getLogger(__name__)
 
-POLL_INTERVAL = 2  # seconds - how often to check playback status
-STATUS_REFRESH_DELAY = 0.5  # seconds - wait for a fresh status after session start
+# play() blocks on one event, set by device status changes and by wake() on
+# skip/stop. This timeout is only a safety net (e.g. skip/stop set by a caller
+# that does not call wake(), and the MAX_SONG_DURATION check).
+STATUS_WAIT_TIMEOUT = 5  # seconds
+# The status cached when the session activates can still describe the previous
+# video; play() waits up to this long for an update pushed after the load.
+STATUS_REFRESH_TIMEOUT = 2  # seconds
+# When connecting before the shared browser has seen the selected device (e.g.
+# first connect after a restart), wait up to this long for it to appear.
+DEVICE_LOOKUP_TIMEOUT = 10  # seconds
 
 
 class DiscoveryListener(AbstractCastListener):
-    """Listener for Chromecast discovery events."""
+    """Listener for Chromecast discovery events.
+
+    Mirrors the browser's device table under its own lock, so the request and
+    playout threads can read it while zeroconf threads update it.
+    """
 
     def __init__(self):
         """Initialize the listener."""
         self.devices: Dict[UUID, CastInfo] = {}
+        # The browser feeding this listener; set right after it is built and
+        # before discovery starts.
+        self.browser: Optional[CastBrowser] = None
+        # uuid -> Event set while that device is known, so a connect can block
+        # until its target shows up instead of sleeping.
+        self._seen: Dict[UUID, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def seen_event(self, uuid: UUID) -> threading.Event:
+        """Return the event that is set while `uuid` is in the device table."""
+        with self._lock:
+            return self._seen.setdefault(uuid, threading.Event())
+
+    def get(self, uuid: UUID) -> Optional[CastInfo]:
+        """Return the CastInfo for `uuid`, or None if it has not been seen."""
+        with self._lock:
+            return self.devices.get(uuid)
+
+    def snapshot(self) -> List[CastInfo]:
+        """Return the currently known devices."""
+        with self._lock:
+            return list(self.devices.values())
 
     def add_cast(self, uuid: UUID, service: str) -> None:
-        """Called when a new cast device is discovered (browser holds the info)."""
-        pass
+        """Called when a new cast device is discovered."""
+        self._record(uuid)
 
     def remove_cast(self, uuid: UUID, service: str, cast_info: CastInfo) -> None:
         """Called when a cast device is removed."""
-        if uuid in self.devices:
-            del self.devices[uuid]
+        with self._lock:
+            self.devices.pop(uuid, None)
+            self._seen.setdefault(uuid, threading.Event()).clear()
 
     def update_cast(self, uuid: UUID, service: str) -> None:
-        """Called when a cast device is updated."""
-        pass
+        """Called when a cast device is updated (e.g. new address)."""
+        self._record(uuid)
+
+    def _record(self, uuid: UUID) -> None:
+        """Copy the browser's current CastInfo for `uuid` and mark it seen."""
+        cast_info = self.browser.devices.get(uuid) if self.browser else None
+        if cast_info is None:
+            return
+        with self._lock:
+            self.devices[uuid] = cast_info
+            self._seen.setdefault(uuid, threading.Event()).set()
+
+
+class MediaStatusWaker(MediaStatusListener):
+    """Media status listener that wakes the playout thread on state changes.
+
+    Some devices push a status update many times a second while playing (the
+    position ticks). play() only cares about (player_state, idle_reason), so
+    updates that leave that pair unchanged are dropped here. ``fresh`` is set
+    by every update, deduplicated or not.
+    """
+
+    def __init__(self):
+        """Initialize with the wake events cleared and no state seen."""
+        self.changed = threading.Event()
+        self.fresh = threading.Event()
+        self._last_state: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+    def reset(self) -> None:
+        """Forget the last state so the next update always wakes (new song)."""
+        self._last_state = None
+        self.changed.clear()
+        self.fresh.clear()
+
+    def new_media_status(self, status: MediaStatus) -> None:
+        """Called from pychromecast's socket thread with each status update."""
+        self.fresh.set()
+        state = (status.player_state, status.idle_reason)
+        if state == self._last_state:
+            return
+        self._last_state = state
+        self.changed.set()
+
+    def load_media_failed(self, queue_item_id: int, error_code: int) -> None:
+        """Called when the device fails to load media; wakes so play() re-reads."""
+        self.changed.set()
 
 
 class ChromecastPlayer:
@@ -78,19 +157,48 @@ class ChromecastPlayer:
         # holds it across its disconnect-idle-connection block, matching the
         # pre-refactor behavior (that block ran under playout_lock).
         self._lock = threading.Lock()
+        # One mDNS browser for the life of the app, started on first scan or
+        # connect. Scans and connects read its live device table instead of
+        # each binding a new zeroconf socket and browsing from scratch.
+        # Guarded by its own lock because starting it does blocking I/O.
+        self._zconf: Optional[Zeroconf] = None
+        self._browser: Optional[CastBrowser] = None
+        self._listener: Optional[DiscoveryListener] = None
+        self._browser_lock = threading.Lock()
+        # Status listener for the current cast, registered on its first play().
+        # pychromecast has no unregister, so one per connection rather than per
+        # song. Only touched by the playout thread.
+        self._status_cast: Optional[pychromecast.Chromecast] = None
+        self._status_waker: Optional[MediaStatusWaker] = None
 
     def startup(self) -> None:
-        """No app-lifetime resources: the cast connection is per playout session."""
+        """Nothing to acquire up front: the discovery browser starts on first use."""
         return None
 
     def shutdown(self) -> None:
-        """No app-lifetime resources: cleanup() already releases the session."""
-        return None
+        """Stop the shared discovery browser, if one was started."""
+        with self._browser_lock:
+            browser = self._browser
+            self._browser = None
+            self._listener = None
+            self._zconf = None
+        if browser is None:
+            return
+        try:
+            # Also closes the Zeroconf instance the browser was given.
+            browser.stop_discovery()
+            logger.info("Chromecast discovery stopped")
+        except Exception as e:
+            logger.warning(f"Error stopping Chromecast discovery: {e}")
 
     async def discover_devices(
         self, timeout: int = 10, keep_connection: bool = False
     ) -> List[Dict]:
-        """Scan the network for Chromecast devices using CastBrowser + AsyncZeroconf.
+        """List Chromecast devices seen by the shared discovery browser.
+
+        The first scan starts the browser and waits `timeout` seconds for
+        devices to answer. Later scans return the browser's current device
+        table immediately, unless it is still empty.
 
         Args:
             timeout: Scan timeout in seconds.
@@ -107,8 +215,8 @@ class ChromecastPlayer:
                         "Scan requested during playback - keeping active connection"
                     )
             elif self._cast:
-                # Disconnect an existing idle connection before scanning; a stale
-                # connection conflicts with AsyncZeroconf. Held across this block
+                # Disconnect an existing idle connection before scanning so the
+                # admin can pick a different device. Held across this block
                 # (matching the pre-refactor behavior) since it's a bounded,
                 # request-thread-only disconnect, not the playout loop.
                 logger.info(f"Disconnecting existing Chromecast: {self._cast.name}")
@@ -123,22 +231,18 @@ class ChromecastPlayer:
 
         logger.info("Scanning for Chromecast devices...")
         try:
-            aiozc = AsyncZeroconf()
-            listener = DiscoveryListener()
-            browser = CastBrowser(listener, aiozc.zeroconf)
-            browser.start_discovery()
-
-            logger.info(f"Waiting {timeout} seconds for device discovery...")
-            await asyncio.sleep(timeout)
+            # Off the loop thread: a Zeroconf created on it would attach to the
+            # running loop, and pychromecast's blocking lookups would deadlock.
+            listener, started = await asyncio.to_thread(self._ensure_browser)
+            if started or not listener.snapshot():
+                logger.info(f"Waiting {timeout} seconds for device discovery...")
+                await asyncio.sleep(timeout)
 
             self.discovered_devices = [
                 {"name": service.friendly_name, "uuid": str(service.uuid)}
-                for service in browser.services.values()
+                for service in listener.snapshot()
             ]
 
-            browser.stop_discovery()
-            await aiozc.async_close()
-
             logger.info(f"Found {len(self.discovered_devices)} Chromecast device(s)")
             return self.discovered_devices
 
@@ -219,6 +323,12 @@ class ChromecastPlayer:
         logger.info(f"URL: {video_url}")
 
         try:
+            waker = self._status_waker_for(cast)
+            changed = waker.changed
+            # Cleared before the load: pychromecast activates the session and
+            # notifies listeners on its socket thread, so the new media's first
+            # status can land before session_active_event.wait() returns.
+            waker.fresh.clear()
             # Use BUFFERED stream type for video files (not LIVE).
             cast.play_media(video_url, "video/mp4", stream_type="BUFFERED")
 
@@ -234,13 +344,18 @@ class ChromecastPlayer:
 
             logger.info("Media session active, monitoring playback...")
 
-            # The status right after session activation can be stale (previous video).
-            time.sleep(STATUS_REFRESH_DELAY)
-            logger.debug("Status refresh delay complete, starting monitoring")
+            # The cached status can still describe the previous video; wait
+            # for an update pushed since the load (often already here).
+            if not waker.fresh.wait(STATUS_REFRESH_TIMEOUT):
+                logger.debug("No status update after session start, monitoring anyway")
 
             playback_start = time.monotonic()
 
             while True:
+                # Cleared before the checks and the status read, so a skip/stop
+                # or status update landing after them still wakes the wait.
+                changed.clear()
+
                 if time.monotonic() - playback_start > MAX_SONG_DURATION:
                     logger.warning("Max song duration exceeded - advancing")
                     cast.media_controller.stop()
@@ -265,14 +380,6 @@ class ChromecastPlayer:
                     if state == "IDLE":
                         idle_reason = mc_status.idle_reason
 
-                        # INTERRUPTED / None mean new media is loading - keep waiting.
-                        if idle_reason == "INTERRUPTED" or idle_reason is None:
-                            logger.debug(
-                                f"IDLE ({idle_reason}) - new media loading, continuing..."
-                            )
-                            time.sleep(POLL_INTERVAL)
-                            continue
-
                         if idle_reason == "FINISHED":
                             logger.info("Finished playing")
                             return PlaybackOutcome.FINISHED
@@ -281,19 +388,56 @@ class ChromecastPlayer:
                             logger.error("Playback error reported by device")
                             return PlaybackOutcome.FAILED
 
-                        logger.warning(f"Idle: {idle_reason} - treating as failure")
-                        return PlaybackOutcome.FAILED
+                        # INTERRUPTED / None mean new media is loading - keep waiting.
+                        if idle_reason not in ("INTERRUPTED", None):
+                            logger.warning(f"Idle: {idle_reason} - treating as failure")
+                            return PlaybackOutcome.FAILED
+
+                        logger.debug(
+                            f"IDLE ({idle_reason}) - new media loading, continuing..."
+                        )
 
                     elif state == "UNKNOWN":
                         logger.warning("Unknown player state")
                         return PlaybackOutcome.FAILED
 
-                time.sleep(POLL_INTERVAL)
+                changed.wait(STATUS_WAIT_TIMEOUT)
 
         except Exception as e:
             logger.error(f"Error during playback: {e}", exc_info=True)
             return PlaybackOutcome.FAILED
 
+    def wake(self) -> None:
+        """Wake a blocked play() so it re-checks skip/stop immediately.
+
+        Called by the controller from a request thread right after it sets
+        skip_event or stop_event.
+        """
+        waker = self._status_waker
+        if waker is not None:
+            waker.changed.set()
+
+    def _status_waker_for(self, cast: pychromecast.Chromecast) -> MediaStatusWaker:
+        """Return the status listener for cast, ready for a new song.
+
+        Registers a MediaStatusWaker the first time a given cast is seen and
+        resets it for the song about to play.
+
+        Args:
+            cast: The connected Chromecast about to play.
+
+        Returns:
+            The cast's MediaStatusWaker, reset; play() clears its changed
+            event before each status read.
+        """
+        if self._status_cast is not cast:
+            waker = MediaStatusWaker()
+            cast.media_controller.register_status_listener(waker)
+            self._status_cast = cast
+            self._status_waker = waker
+        self._status_waker.reset()
+        return self._status_waker
+
     def cleanup(self) -> None:
         """Quit the cast app and disconnect. Safe to call when not connected."""
         with self._lock:
@@ -309,47 +453,55 @@ class ChromecastPlayer:
         except Exception as e:
             logger.warning(f"Error during cleanup: {e}")
 
-    def _connect_to_device(self, device_uuid: str) -> Optional[pychromecast.Chromecast]:
-        """Connect to a Chromecast device by UUID using CastBrowser.
+    def _ensure_browser(self) -> Tuple[DiscoveryListener, bool]:
+        """Return the shared browser's listener, starting discovery on first use.
 
-        Args:
-            device_uuid: UUID string of the target device.
+        Must not run on the event loop thread (see discover_devices).
 
         Returns:
-            A connected Chromecast, or None if not found / on error.
+            Tuple of (listener, started); started is True if this call created
+            the browser.
         """
-        try:
+        with self._browser_lock:
+            if self._browser is not None:
+                return self._listener, False
             zconf = Zeroconf()
             listener = DiscoveryListener()
             browser = CastBrowser(listener, zconf)
+            listener.browser = browser
             browser.start_discovery()
+            self._zconf = zconf
+            self._listener = listener
+            self._browser = browser
+            logger.info("Chromecast discovery started")
+            return listener, True
 
-            logger.info("Searching for Chromecast device...")
-            time.sleep(5)
+    def _connect_to_device(self, device_uuid: str) -> Optional[pychromecast.Chromecast]:
+        """Connect to a Chromecast device by UUID via the shared browser.
 
-            cast = None
-            for uuid, service in browser.services.items():
-                if str(uuid) == device_uuid:
-                    # get_listed_chromecasts spins up its own browser/zeroconf which
-                    # must be stopped to avoid leaking an mDNS browser thread.
-                    chromecasts, host_browser = pychromecast.get_listed_chromecasts(
-                        friendly_names=[service.friendly_name]
-                    )
-                    try:
-                        if chromecasts:
-                            cast = chromecasts[0]
-                            cast.wait()
-                            logger.info(f"Connected to Chromecast: {cast.name}")
-                    finally:
-                        pychromecast.discovery.stop_discovery(host_browser)
-                    break
+        Args:
+            device_uuid: UUID string of the target device.
 
-            browser.stop_discovery()
-            zconf.close()
+        Returns:
+            A connected Chromecast, or None if not found / on error.
+        """
+        try:
+            listener, _ = self._ensure_browser()
+            target = UUID(device_uuid)
+
+            cast_info = listener.get(target)
+            if cast_info is None:
+                logger.info("Waiting for Chromecast device to be discovered...")
+                listener.seen_event(target).wait(DEVICE_LOOKUP_TIMEOUT)
+                cast_info = listener.get(target)
 
-            if not cast:
+            if cast_info is None:
                 logger.error(f"Chromecast not found: {device_uuid}")
+                return None
 
+            cast = pychromecast.get_chromecast_from_cast_info(cast_info, self._zconf)
+            cast.wait()
+            logger.info(f"Connected to Chromecast: {cast.name}")
             return cast
 
         except Exception as e:
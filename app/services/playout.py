@@ -14,14 +14,14 @@ async database via run_coroutine_threadsafe against the main loop.
 import asyncio
 import logging
 import threading
-import time
 from typing import Dict, List, Optional, Tuple
 
 # project imports
 from app.config import settings
-from app.database import get_db
+from app.database import SQL_DELETE_BY_ID, SQL_UPDATE_STATUS, get_db
 from app.services.players import PlaybackOutcome, Player
 from app.services.players.factory import create_player
+from app.services.queue_manager import queue_manager
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +45,10 @@ class PlayoutService:
         """
         self.player = player
 
-        # Playback state (thread-safe)
-        self.is_playing = False
+        # Playback state (thread-safe). The flag is an Event so reads and the
+        # one-way clears need no lock; playout_lock only serializes the
+        # start/stop transitions, which also touch the thread and the events.
+        self._playing = threading.Event()
         self.playout_thread: Optional[threading.Thread] = None
         self.playout_lock = threading.Lock()
         self.skip_requested = threading.Event()
@@ -59,6 +61,18 @@ class PlayoutService:
         # Main event loop reference for cross-thread async calls
         self.main_loop: Optional[asyncio.AbstractEventLoop] = None
 
+    @property
+    def is_playing(self) -> bool:
+        """Whether the playout loop is (or is about to be) running."""
+        return self._playing.is_set()
+
+    @is_playing.setter
+    def is_playing(self, value: bool) -> None:
+        if value:
+            self._playing.set()
+        else:
+            self._playing.clear()
+
     @property
     def selected_device_uuid(self) -> Optional[str]:
         """Currently selected output device id (passthrough for /admin/status)."""
@@ -96,7 +110,7 @@ class PlayoutService:
         # and there is no await between this read and the backend's disconnect
         # decision; do not introduce one without moving the check into the backend.
         return await self.player.discover_devices(
-            timeout=timeout, keep_connection=self.is_playing
+            timeout=timeout, keep_connection=self._playing.is_set()
         )
 
     def select_device(self, device_uuid: str) -> bool:
@@ -160,13 +174,13 @@ class PlayoutService:
             Dict with 'success' and 'message' keys.
         """
         with self.playout_lock:
-            if self.is_playing:
+            if self._playing.is_set():
                 return {"success": False, "message": "Playback is already active"}
 
             if self.player.supports_discovery and not self.player.selected_device_uuid:
                 return {"success": False, "message": "No playback device selected"}
 
-            self.is_playing = True
+            self._playing.set()
             self.stop_requested.clear()
             self.skip_requested.clear()
 
@@ -185,11 +199,12 @@ class PlayoutService:
             Dict with 'success' and 'message' keys.
         """
         with self.playout_lock:
-            if not self.is_playing:
+            if not self._playing.is_set():
                 return {"success": False, "message": "Playback is not active"}
 
-            self.is_playing = False
+            self._playing.clear()
             self.stop_requested.set()
+            self._wake_player()
             logger.info("Stop signal sent to playout loop")
 
         return {"success": True, "message": "Playback stopped"}
@@ -200,12 +215,12 @@ class PlayoutService:
         Returns:
             Dict with 'success' and 'message' keys.
         """
-        with self.playout_lock:
-            if not self.is_playing:
-                return {"success": False, "message": "Playback is not active"}
+        if not self._playing.is_set():
+            return {"success": False, "message": "Playback is not active"}
 
-            self.skip_requested.set()
-            logger.info("Skip signal sent to playout loop")
+        self.skip_requested.set()
+        self._wake_player()
+        logger.info("Skip signal sent to playout loop")
 
         return {"success": True, "message": "Skipping current song"}
 
@@ -217,8 +232,8 @@ class PlayoutService:
         """
         logger.info("Shutting down playout service")
         self.stop_requested.set()
-        with self.playout_lock:
-            self.is_playing = False
+        self._wake_player()
+        self._playing.clear()
         thread = self.playout_thread
         if thread and thread.is_alive():
             thread.join(timeout=timeout)
@@ -227,6 +242,12 @@ class PlayoutService:
         # After the join so the playout thread cannot race the release.
         self.player.shutdown()
 
+    def _wake_player(self) -> None:
+        """Let the backend notice a skip/stop now, if it supports wake()."""
+        wake_fn = getattr(self.player, "wake", None)
+        if wake_fn is not None:
+            wake_fn()
+
     def _playout_loop(self) -> None:
         """Background thread: play queue items until stopped.
 
@@ -239,8 +260,7 @@ class PlayoutService:
         try:
             if not self.player.connect():
                 logger.error("Failed to connect to playback device, stopping playback")
-                with self.playout_lock:
-                    self.is_playing = False
+                self._playing.clear()
                 return
             connected = True
 
@@ -252,7 +272,8 @@ class PlayoutService:
                 queue = self._get_queue_sync()
                 if not queue:
                     logger.info("Queue is empty, waiting for songs to be added...")
-                    time.sleep(QUEUE_POLL_INTERVAL)
+                    if self.stop_requested.wait(QUEUE_POLL_INTERVAL):
+                        break
                     continue
 
                 item = queue[0]
@@ -285,15 +306,16 @@ class PlayoutService:
                 logger.info(f"Playback outcome for '{title}': {outcome.name}")
                 self._apply_outcome(queue_id, title, outcome)
 
-                time.sleep(INTER_SONG_PAUSE)
+                # Waiting on the stop event lets a stop land mid-pause
+                if self.stop_requested.wait(INTER_SONG_PAUSE):
+                    break
 
         except Exception as e:
             logger.error(f"Playout loop error: {e}", exc_info=True)
 
         finally:
             logger.info("Cleaning up playout thread...")
-            with self.playout_lock:
-                self.is_playing = False
+            self._playing.clear()
             if connected:
                 self.player.cleanup()
             logger.info("Playout thread finished")
@@ -337,22 +359,18 @@ class PlayoutService:
     def _get_queue_sync(self) -> List[Dict]:
         """Read active queue rows from the playout thread.
 
+        Goes through queue_manager so the idle poll is served from its
+        in-memory snapshot rather than a query every QUEUE_POLL_INTERVAL.
+
         Returns:
             Row dicts ordered by added_at (statuses 'queued' and 'playing').
+            The list is queue_manager's shared snapshot; do not mutate it.
         """
         self._require_loop()
         try:
-
-            async def get_queue():
-                async with get_db() as db:
-                    cursor = await db.execute(
-                        "SELECT id, video_id, title, username FROM queue "
-                        "WHERE status != 'completed' ORDER BY added_at ASC"
-                    )
-                    rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
-
-            future = asyncio.run_coroutine_threadsafe(get_queue(), self.main_loop)
+            future = asyncio.run_coroutine_threadsafe(
+                queue_manager.get_queue(), self.main_loop
+            )
             return future.result(timeout=30)
 
         except Exception as e:
@@ -370,12 +388,9 @@ class PlayoutService:
 
             async def remove():
                 async with get_db() as db:
-                    await db.execute("DELETE FROM queue WHERE id = ?", (queue_id,))
+                    await db.execute(SQL_DELETE_BY_ID, (queue_id,))
                     await db.commit()
 
-                # Import here to avoid circular dependency
-                from app.services.queue_manager import queue_manager
-
                 await queue_manager.broadcast_queue_update()
 
             future = asyncio.run_coroutine_threadsafe(remove(), self.main_loop)
@@ -396,13 +411,9 @@ class PlayoutService:
 
             async def update():
                 async with get_db() as db:
-                    await db.execute(
-                        "UPDATE queue SET status = ? WHERE id = ?", (status, queue_id)
-                    )
+                    await db.execute(SQL_UPDATE_STATUS, (status, queue_id))
                     await db.commit()
 
-                from app.services.queue_manager import queue_manager
-
                 await queue_manager.broadcast_queue_update()
 
             future = asyncio.run_coroutine_threadsafe(update(), self.main_loop)
@@ -7,22 +7,53 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional
-
-from fastapi.templating import Jinja2Templates
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
 
 from app.config import settings
-from app.database import get_db
+from app.database import (
+    SQL_COUNT_ACTIVE,
+    SQL_DELETE_BY_ID,
+    SQL_DELETE_OLDER_THAN,
+    SQL_DELETE_OWNED,
+    SQL_INSERT_QUEUE,
+    SQL_SELECT_ACTIVE_QUEUE,
+    SQL_SELECT_OWNER,
+    SQL_SELECT_PLAYING,
+    SQL_UPDATE_STATUS,
+    get_db,
+)
+from app.services.download import download_service
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 
-# Initialize templates
-templates = Jinja2Templates(directory="app/templates")
+# Cap each client's pending-event buffer: room for one queue update and one
+# heartbeat. Every queue update carries the whole queue, so when a slow client
+# (stalled tab, dropped TCP) has a full buffer its unread events are stale and
+# the next update replaces them; memory per client stays bounded.
+SSE_QUEUE_MAXSIZE = 2
+
+# The heartbeat frame never changes, so it is formatted once.
+SSE_HEARTBEAT_EVENT = f"event: heartbeat\ndata: {json.dumps({'status': 'ok'})}\n\n"
+# One background task pushes the heartbeat to every client at this interval,
+# instead of each client timing out its own read.
+SSE_HEARTBEAT_INTERVAL = 15.0  # seconds
+
+# With many SSE clients the fan-out yields to the event loop after each batch,
+# so request handlers are not held up behind one long broadcast.
+SSE_BROADCAST_BATCH = 50
 
-# Cap each client's pending-event buffer. A client that stops reading (stalled
-# tab, dropped TCP) cannot grow memory without bound; once full it is dropped.
-SSE_QUEUE_MAXSIZE = 100
+# Rendering a long queue is tens of ms of pure Python; above this many items it
+# runs in a worker thread so the event loop keeps serving requests meanwhile.
+# Shorter queues render inline, where the thread hop would cost more.
+RENDER_IN_THREAD_MIN_ITEMS = 30
+
+# Queue changes can come in bursts (admin clear, playout retries). Clients get
+# at most one queue-update per interval: the first change goes out at once,
+# later ones inside the window fold into a single trailing broadcast of the
+# latest state.
+BROADCAST_MIN_INTERVAL = 0.2  # seconds
 
 
 class QueueManager:
@@ -30,9 +61,38 @@ class QueueManager:
 
     def __init__(self):
         """Initialize the queue manager."""
-        # List of active SSE connections with user context
-        # Each item: {"queue": asyncio.Queue, "username": str, "is_admin": bool}
-        self._connections: List[Dict] = []
+        # Active SSE connections with user context, keyed by id() of the
+        # value so a disconnect removes its entry in O(1).
+        # Each value: {"queue": asyncio.Queue, "username": str, "is_admin": bool}
+        self._connections: Dict[int, Dict] = {}
+        # In-memory copy of the active queue, loaded on first read and dropped
+        # on every change. _version counts changes so a read that raced a
+        # write never stores a stale snapshot (and gives clients a cheap
+        # change stamp).
+        self._snapshot: Optional[List[Dict]] = None
+        self._version = 0
+        # Formatted queue-update events keyed by (username, is_admin); all
+        # admins share the (None, True) entry. Dropped with the snapshot.
+        self._events: Dict[Tuple[Optional[str], bool], str] = {}
+        # Broadcast rate limiting (see BROADCAST_MIN_INTERVAL), in loop time.
+        self._last_broadcast = float("-inf")
+        self._pending_broadcast: Optional[asyncio.Task] = None
+        # Strong references to send tasks until they finish (the loop itself
+        # only keeps weak ones).
+        self._broadcast_tasks: Set[asyncio.Task] = set()
+        # Runs while there are SSE connections (see _heartbeat_loop).
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every queue change."""
+        return self._version
+
+    def invalidate(self) -> None:
+        """Drop the cached queue snapshot after a write to the queue table."""
+        self._snapshot = None
+        self._events = {}
+        self._version += 1
 
     async def add_to_queue(
         self,
@@ -67,29 +127,19 @@ class QueueManager:
                 raise ValueError(f"Queue is full (max: {settings.max_queue_size})")
 
         async with get_db() as db:
-            # Check if THIS USER already has this video in queue
+            # Add to queue unless THIS USER already has this video in queue
             # Multiple users can queue the same video (they each want to sing it)
             # Users can also re-queue a video after it's been played and removed
-            cursor = await db.execute(
-                "SELECT id FROM queue WHERE video_id = ? AND username = ? AND status != 'completed'",
-                (video_id, username),
-            )
-            existing = await cursor.fetchone()
-
-            if existing:
-                raise ValueError("You have already queued this video")
-
-            # Add to queue
             added_at = datetime.now(timezone.utc).isoformat()
             cursor = await db.execute(
-                """
-                INSERT INTO queue (video_id, title, thumbnail_url, duration, views, username, added_at, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 'queued')
-                """,
+                SQL_INSERT_QUEUE,
                 (video_id, title, thumbnail_url, duration, views, username, added_at),
             )
             await db.commit()
 
+            if cursor.rowcount == 0:
+                raise ValueError("You have already queued this video")
+
             queue_id = cursor.lastrowid
             logger.info(f"Added to queue: {title} (ID: {queue_id}) by {username}")
 
@@ -126,22 +176,21 @@ class QueueManager:
             PermissionError: If user doesn't own the item and is not admin
         """
         async with get_db() as db:
-            # Check ownership if not admin
             if not is_admin and username:
-                cursor = await db.execute(
-                    "SELECT username FROM queue WHERE id = ?", (queue_id,)
-                )
-                row = await cursor.fetchone()
-
-                if not row:
+                # Ownership is checked by the DELETE itself, so the common
+                # case is one statement. Only a miss looks the row up again to
+                # tell "not found" from "not yours".
+                cursor = await db.execute(SQL_DELETE_OWNED, (queue_id, username))
+                await db.commit()
+                if cursor.rowcount == 0:
+                    if await db.execute_fetchall(SQL_SELECT_OWNER, (queue_id,)):
+                        raise PermissionError(
+                            "You can only remove your own queued songs"
+                        )
                     return False
-
-                if row["username"] != username:
-                    raise PermissionError("You can only remove your own queued songs")
-
-            # Remove from queue
-            cursor = await db.execute("DELETE FROM queue WHERE id = ?", (queue_id,))
-            await db.commit()
+            else:
+                cursor = await db.execute(SQL_DELETE_BY_ID, (queue_id,))
+                await db.commit()
 
             if cursor.rowcount > 0:
                 logger.info(
@@ -156,44 +205,53 @@ class QueueManager:
         """
         Get all items in the queue, ordered by added_at.
 
+        Served from the in-memory snapshot when it is current; otherwise the
+        queue is read from the database and cached until the next change.
+        The returned list is shared and must not be mutated.
+
         Returns:
             List of queue item dictionaries
         """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        version = self._version
+        # execute_fetchall runs the query and the fetch in one hop to the
+        # aiosqlite worker thread instead of two.
         async with get_db() as db:
-            cursor = await db.execute(
-                """
-                SELECT id, video_id, title, thumbnail_url, duration, views, username, added_at, status
-                FROM queue
-                WHERE status != 'completed'
-                ORDER BY added_at ASC
-                """
-            )
-            rows = await cursor.fetchall()
+            rows = await db.execute_fetchall(SQL_SELECT_ACTIVE_QUEUE)
 
-            return [dict(row) for row in rows]
+        snapshot = [dict(row) for row in rows]
+        # A write during the query invalidated what we just read; keep it for
+        # this caller but do not cache it.
+        if version == self._version:
+            self._snapshot = snapshot
+        return snapshot
 
     async def get_queue_size(self) -> int:
         """Get the current number of items in the queue."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return len(snapshot)
         async with get_db() as db:
-            cursor = await db.execute(
-                "SELECT COUNT(*) as count FROM queue WHERE status != 'completed'"
-            )
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+            rows = await db.execute_fetchall(SQL_COUNT_ACTIVE)
+            return rows[0]["count"] if rows else 0
 
     async def get_currently_playing(self) -> Optional[Dict]:
-        """Get the currently playing queue item, if any."""
-        async with get_db() as db:
-            cursor = await db.execute(
-                """
-                SELECT id, video_id, title, thumbnail_url, duration, views, username, added_at, status
-                FROM queue
-                WHERE status = 'playing'
-                LIMIT 1
-                """
+        """Get the currently playing queue item, if any.
+
+        Served from the snapshot when it is current (the returned dict is then
+        shared and must not be mutated).
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return next(
+                (item for item in snapshot if item["status"] == "playing"), None
             )
-            row = await cursor.fetchone()
-            return dict(row) if row else None
+        async with get_db() as db:
+            rows = await db.execute_fetchall(SQL_SELECT_PLAYING)
+            return dict(rows[0]) if rows else None
 
     async def update_status(self, queue_id: int, status: str) -> bool:
         """
@@ -207,9 +265,7 @@ class QueueManager:
             True if updated, False if not found
         """
         async with get_db() as db:
-            cursor = await db.execute(
-                "UPDATE queue SET status = ? WHERE id = ?", (status, queue_id)
-            )
+            cursor = await db.execute(SQL_UPDATE_STATUS, (status, queue_id))
             await db.commit()
 
             if cursor.rowcount > 0:
@@ -229,14 +285,9 @@ class QueueManager:
         Returns:
             Number of items removed
         """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_threshold)
         async with get_db() as db:
-            cursor = await db.execute(
-                """
-                DELETE FROM queue
-                WHERE datetime(added_at) < datetime('now', '-' || ? || ' hours')
-                """,
-                (hours_threshold,),
-            )
+            cursor = await db.execute(SQL_DELETE_OLDER_THAN, (cutoff.isoformat(),))
             await db.commit()
             count = cursor.rowcount
 
@@ -284,8 +335,7 @@ class QueueManager:
             return 0
 
         async with get_db() as db:
-            cursor = await db.execute("SELECT DISTINCT video_id FROM queue")
-            rows = await cursor.fetchall()
+            rows = await db.execute_fetchall("SELECT DISTINCT video_id FROM queue")
         referenced = {row["video_id"] for row in rows}
 
         cutoff = time.time() - (hours_threshold * 3600)
@@ -297,6 +347,7 @@ class QueueManager:
                 if video_file.stat().st_mtime > cutoff:
                     continue
                 video_file.unlink()
+                download_service.forget(video_file.stem)
                 deleted += 1
                 logger.info(f"Deleted unreferenced video file: {video_file.name}")
             except OSError as e:
@@ -356,62 +407,168 @@ class QueueManager:
         conn_queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
         # Store connection with user context
         conn_data = {"queue": conn_queue, "username": username, "is_admin": is_admin}
-        self._connections.append(conn_data)
-        logger.info(
+        self._connections[id(conn_data)] = conn_data
+        logger.debug(
             f"SSE client connected ({username}). Total connections: {len(self._connections)}"
         )
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
         try:
             # Send initial queue state (rendered as HTML)
-            initial_queue = await self.get_queue()
-            html = self._render_queue_html(initial_queue, username, is_admin)
-            yield self._format_sse_event("queue-update", html, is_html=True)
+            yield await self._queue_event(username, is_admin)
 
-            # Send heartbeat and updates
+            # Send updates and heartbeats as they are queued
             while True:
-                try:
-                    # Wait for update or timeout for heartbeat
-                    event = await asyncio.wait_for(conn_queue.get(), timeout=15.0)
-                    yield event
-                except asyncio.TimeoutError:
-                    # Send heartbeat to keep connection alive
-                    yield self._format_sse_event("heartbeat", {"status": "ok"})
+                yield await conn_queue.get()
 
         except asyncio.CancelledError:
-            logger.info("SSE client connection cancelled")
+            logger.debug("SSE client connection cancelled")
         finally:
-            self._connections.remove(conn_data)
-            logger.info(
+            self._connections.pop(id(conn_data), None)
+            logger.debug(
                 f"SSE client disconnected ({username}). Total connections: {len(self._connections)}"
             )
+            if not self._connections and self._heartbeat_task is not None:
+                self._heartbeat_task.cancel()
+                self._heartbeat_task = None
+
+    async def shutdown(self) -> None:
+        """Cancel pending broadcasts and the heartbeat, waiting for them to end.
+
+        Called from the app lifespan before close_db(), so no send task can
+        read the shared connection after it is closed.
+        """
+        tasks = list(self._broadcast_tasks)
+        if self._heartbeat_task is not None:
+            tasks.append(self._heartbeat_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._broadcast_tasks.clear()
+        self._pending_broadcast = None
+        self._heartbeat_task = None
+        logger.debug(f"Queue manager stopped ({len(tasks)} task(s) cancelled)")
+
+    async def _heartbeat_loop(self) -> None:
+        """Queue a heartbeat for every SSE client each SSE_HEARTBEAT_INTERVAL.
+
+        Started by the first subscribe() and cancelled when the last client
+        disconnects. A client whose buffer is full is skipped: it already
+        has data coming.
+        """
+        while True:
+            await asyncio.sleep(SSE_HEARTBEAT_INTERVAL)
+            for conn_data in self._connections.values():
+                try:
+                    conn_data["queue"].put_nowait(SSE_HEARTBEAT_EVENT)
+                except asyncio.QueueFull:
+                    pass
 
     async def broadcast_queue_update(self) -> None:
-        """Broadcast the current queue state to all connected SSE clients."""
-        if not self._connections:
+        """Broadcast the current queue state to all connected SSE clients.
+
+        Every write to the queue table (including the playout thread's) is
+        followed by a broadcast, so this is also where the cached snapshot
+        is invalidated. The invalidation is immediate; the send runs as a
+        background task, so the write that triggered it returns without
+        waiting for the render and fan-out. The send is deferred when another
+        broadcast went out less than BROADCAST_MIN_INTERVAL ago.
+        """
+        self.invalidate()
+        if not self._connections or self._pending_broadcast is not None:
+            # A pending broadcast will read the state as of its send.
             return
 
-        queue_data = await self.get_queue()
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._last_broadcast + BROADCAST_MIN_INTERVAL - loop.time())
+        task = asyncio.create_task(self._send_queue_update(delay))
+        self._pending_broadcast = task
+        self._broadcast_tasks.add(task)
+        task.add_done_callback(self._broadcast_tasks.discard)
 
-        # Send individualized HTML to each client
+    async def _send_queue_update(self, delay: float = 0) -> None:
+        """Render the queue and push it to every SSE connection.
+
+        Args:
+            delay: Seconds to wait first (trailing broadcast).
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        # From here on a new change needs a broadcast of its own.
+        self._pending_broadcast = None
+        self._last_broadcast = asyncio.get_running_loop().time()
+
+        # One render per distinct user plus one shared by all admins, however
+        # many tabs each has open. Iterate a copy: a render may await, letting
+        # clients come and go.
+        events: Dict[Tuple[Optional[str], bool], str] = {}
         dead_connections = []
-        for conn_data in self._connections:
+        for index, conn_data in enumerate(list(self._connections.values())):
+            if index and index % SSE_BROADCAST_BATCH == 0:
+                await asyncio.sleep(0)
             try:
-                # Render HTML for this specific client
-                html = self._render_queue_html(
-                    queue_data, conn_data["username"], conn_data["is_admin"]
-                )
-                event = self._format_sse_event("queue-update", html, is_html=True)
-                conn_data["queue"].put_nowait(event)
+                key = self._event_key(conn_data["username"], conn_data["is_admin"])
+                event = events.get(key)
+                if event is None:
+                    event = events[key] = await self._queue_event(*key)
+                conn_queue = conn_data["queue"]
+                if conn_queue.full():
+                    # Coalesce: the unread events are older than this one.
+                    while not conn_queue.empty():
+                        conn_queue.get_nowait()
+                conn_queue.put_nowait(event)
             except Exception as e:
                 logger.warning(f"Failed to send to SSE client: {e}")
                 dead_connections.append(conn_data)
 
         # Clean up dead connections
         for conn in dead_connections:
-            try:
-                self._connections.remove(conn)
-            except ValueError:
-                pass
+            self._connections.pop(id(conn), None)
+
+    @staticmethod
+    def _event_key(
+        username: Optional[str], is_admin: bool
+    ) -> Tuple[Optional[str], bool]:
+        """Return the _events key for a viewer.
+
+        The admin template does not depend on the viewer, so every admin
+        maps to (None, True); users keep their name, which decides the
+        Remove buttons they see.
+        """
+        return (None, True) if is_admin else (username, False)
+
+    async def _queue_event(self, username: Optional[str], is_admin: bool) -> str:
+        """Return the queue-update SSE event for one viewer.
+
+        Cached per _event_key() until the next invalidate().
+
+        Args:
+            username: Username of the client.
+            is_admin: Whether to render the admin view.
+
+        Returns:
+            SSE-formatted queue-update event.
+        """
+        key = self._event_key(username, is_admin)
+        username = key[0]
+        event = self._events.get(key)
+        if event is not None:
+            return event
+
+        version = self._version
+        queue_data = await self.get_queue()
+        if len(queue_data) >= RENDER_IN_THREAD_MIN_ITEMS:
+            html = await asyncio.to_thread(
+                self._render_queue_html, queue_data, username, is_admin
+            )
+        else:
+            html = self._render_queue_html(queue_data, username, is_admin)
+        event = self._format_sse_event("queue-update", html, is_html=True)
+        # As in get_queue: never cache what a concurrent write made stale.
+        if version == self._version:
+            self._events[key] = event
+        return event
 
     def _render_queue_html(
         self, queue: List[Dict], username: str = None, is_admin: bool = False
@@ -427,15 +584,6 @@ class QueueManager:
         Returns:
             Rendered HTML string
         """
-        # Create a fake request object for template rendering
-        from starlette.datastructures import Headers
-
-        fake_request = type(
-            "obj",
-            (object,),
-            {"headers": Headers({}), "url": type("obj", (object,), {"path": "/"})()},
-        )()
-
         # Use admin template for admin users, regular template for others
         template_name = (
             "partials/admin_queue.html" if is_admin else "partials/queue.html"
@@ -443,7 +591,6 @@ class QueueManager:
 
         html = templates.get_template(template_name).render(
             {
-                "request": fake_request,
                 "queue": queue,
                 "username": username,
                 "is_admin": is_admin,
@@ -470,10 +617,10 @@ class QueueManager:
             SSE-formatted string
         """
         if is_html:
-            # For multiline HTML, each line must be prefixed with "data: "
-            lines = data.split("\n")
-            data_lines = "\n".join(f"data: {line}" for line in lines)
-            return f"event: {event_type}\n{data_lines}\n\n"
+            # For multiline HTML, each line must be prefixed with "data: ";
+            # one replace does it without a list of per-line strings.
+            data_lines = data.replace("\n", "\ndata: ")
+            return f"event: {event_type}\ndata: {data_lines}\n\n"
         else:
             # For other data, JSON-encode
             json_data = json.dumps(data)
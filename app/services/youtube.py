@@ -5,14 +5,32 @@ Searches for karaoke videos and returns metadata.
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import List, Dict
+from googleapiclient.http import build_http
+from typing import List, Dict, FrozenSet, Tuple
 from app.config import settings
 import isodate
 import asyncio
 import logging
+import re
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Search results are cached in-process per normalized query. Popular songs are
+# searched over and over during a session, and each miss costs two API calls
+# (search + videos) against the daily quota plus a few hundred ms of latency.
+SEARCH_CACHE_TTL = 600  # seconds
+SEARCH_CACHE_SIZE = 256  # entries; oldest evicted first
+# Parsed per-video metadata, shared across queries: different searches for the
+# same song keep returning the same videos, and hits skip the videos.list call.
+VIDEO_CACHE_TTL = 3600  # seconds
+VIDEO_CACHE_SIZE = 1024  # entries; oldest evicted first
+
+# contentDetails.duration is almost always the plain PT#H#M#S form; anything
+# else (days, fractions) falls back to isodate.
+DURATION_RE = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
 
 class YouTubeError(Exception):
     """Search failed. `user_message` is safe to show to end users."""
@@ -27,8 +45,133 @@ class YouTubeService:
     """Service for searching YouTube videos."""
 
     def __init__(self):
-        """Initialize YouTube API client."""
-        self.youtube = build("youtube", "v3", developerKey=settings.youtube_api_key)
+        """Initialize the service; the API client is built on first use."""
+        self._youtube = None
+        # (normalized query, max_results) -> (fetched_at, results)
+        self._search_cache: Dict[Tuple[str, int], Tuple[float, List[Dict]]] = {}
+        # Searches currently in flight, so concurrent identical queries share
+        # one API round-trip instead of stampeding the quota.
+        self._inflight: Dict[Tuple[str, int], asyncio.Task] = {}
+        # video_id -> (fetched_at, parsed result dict); see VIDEO_CACHE_TTL
+        self._video_cache: Dict[str, Tuple[float, Dict]] = {}
+        # One httplib2.Http per worker thread. httplib2 is not thread-safe, so
+        # the connection build() creates can't be shared across to_thread
+        # calls, but a per-thread one keeps its TLS connection alive between
+        # searches instead of handshaking with googleapis.com every time.
+        self._local = threading.local()
+
+    @property
+    def youtube(self):
+        """The googleapiclient resource, built lazily on first access.
+
+        build() loads and parses the API discovery document, which is the
+        expensive part of constructing this service. Deferring it keeps
+        processes that never search (startup, tests, maintenance scripts)
+        from paying for it.
+        """
+        if self._youtube is None:
+            self._youtube = build(
+                "youtube", "v3", developerKey=settings.youtube_api_key
+            )
+        return self._youtube
+
+    def _http(self):
+        """The calling thread's keep-alive httplib2.Http, created on first use."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = build_http()
+        return http
+
+    def _fetch_video_items(
+        self, search_query: str, max_results: int, known: FrozenSet[str]
+    ) -> Tuple[List[str], List[Dict]]:
+        """Run search.list then videos.list for its unknown hits (blocking).
+
+        Args:
+            search_query: Full query sent to YouTube.
+            max_results: Maximum number of search hits.
+            known: Video ids with fresh cached metadata; not fetched again.
+
+        Returns:
+            Tuple of (search hit ids in relevance order, videos.list items for
+            the hits not in known). The items list is [] when nothing needed
+            fetching.
+        """
+        http = self._http()
+        search_response = (
+            self.youtube.search()
+            .list(
+                q=search_query,
+                part="id,snippet",
+                type="video",
+                maxResults=max_results,
+                order="relevance",  # Order by relevance (best match)
+                videoCategoryId="10",  # Music category
+            )
+            .execute(http=http)
+        )
+
+        video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
+        missing = [video_id for video_id in video_ids if video_id not in known]
+        if not missing:
+            return video_ids, []
+
+        # Get detailed video statistics and content details
+        videos_response = (
+            self.youtube.videos()
+            .list(id=",".join(missing), part="snippet,contentDetails,statistics")
+            .execute(http=http)
+        )
+        return video_ids, videos_response.get("items", [])
+
+    @staticmethod
+    def _parse_video_item(item: Dict) -> Dict:
+        """Turn one videos.list item into a search result dict.
+
+        Args:
+            item: videos.list item with snippet, contentDetails, statistics.
+
+        Returns:
+            Result dict, as described in search().
+
+        Raises:
+            KeyError, ValueError: If the item is missing or has malformed fields.
+        """
+        # Parse ISO 8601 duration to seconds
+        duration_iso = item["contentDetails"]["duration"]
+        match = DURATION_RE.fullmatch(duration_iso)
+        if match:
+            hours, minutes, seconds = (int(part or 0) for part in match.groups())
+            duration_seconds = hours * 3600 + minutes * 60 + seconds
+        else:
+            duration_seconds = int(isodate.parse_duration(duration_iso).total_seconds())
+
+        # Get view count
+        view_count = int(item["statistics"].get("viewCount", 0))
+
+        # Get thumbnail (prefer high quality)
+        thumbnails = item["snippet"]["thumbnails"]
+        thumbnail_url = (
+            thumbnails.get("high", {}).get("url")
+            or thumbnails.get("medium", {}).get("url")
+            or thumbnails.get("default", {}).get("url", "")
+        )
+
+        return {
+            "video_id": item["id"],
+            "title": item["snippet"]["title"],
+            "thumbnail_url": thumbnail_url,
+            "duration": duration_seconds,
+            "views": view_count,
+        }
+
+    def _cache_video(self, result: Dict) -> None:
+        """Store a parsed result in the per-video cache, evicting the oldest."""
+        video_id = result["video_id"]
+        self._video_cache.pop(video_id, None)
+        if len(self._video_cache) >= VIDEO_CACHE_SIZE:
+            del self._video_cache[next(iter(self._video_cache))]
+        self._video_cache[video_id] = (time.monotonic(), result)
 
     async def search(self, query: str, max_results: int = 20) -> List[Dict]:
         """
@@ -47,7 +190,45 @@ class YouTubeService:
                 - views: View count
 
         Raises:
-            Exception: If YouTube API request fails
+            YouTubeError: If the YouTube API request fails
+
+        Results are cached for SEARCH_CACHE_TTL seconds, keyed by the
+        case- and whitespace-normalized query. Failures are never cached.
+        The returned list is shared with the cache and must not be mutated.
+        """
+        key = (" ".join(query.lower().split()), max_results)
+        cached = self._search_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            logger.info(f"YouTube search cache hit for: {query} karaoke")
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search_uncached(query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one client disconnecting does not cancel the shared call
+        results = await asyncio.shield(task)
+
+        self._search_cache.pop(key, None)
+        if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+            del self._search_cache[next(iter(self._search_cache))]
+        self._search_cache[key] = (time.monotonic(), results)
+        return results
+
+    async def _search_uncached(self, query: str, max_results: int) -> List[Dict]:
+        """
+        Run a search against the YouTube Data API.
+
+        Args:
+            query: User's search query (will have 'karaoke' appended)
+            max_results: Maximum number of results to return
+
+        Returns:
+            List of video dictionaries, as described in search()
+
+        Raises:
+            YouTubeError: If the YouTube API request fails
         """
         # Append 'karaoke' to the search query
         search_query = f"{query} karaoke"
@@ -55,77 +236,36 @@ class YouTubeService:
         logger.info(f"Searching YouTube for: {search_query}")
 
         try:
-            # Search for videos (run in thread pool as API is synchronous)
-            search_response = await asyncio.to_thread(
-                lambda: (
-                    self.youtube.search()
-                    .list(
-                        q=search_query,
-                        part="id,snippet",
-                        type="video",
-                        maxResults=max_results,
-                        order="relevance",  # Order by relevance (best match)
-                        videoCategoryId="10",  # Music category
-                    )
-                    .execute()
-                )
+            now = time.monotonic()
+            known = {
+                video_id: result
+                for video_id, (fetched_at, result) in self._video_cache.items()
+                if now - fetched_at < VIDEO_CACHE_TTL
+            }
+            # Both API calls run in one worker thread (the client is
+            # synchronous), sharing its keep-alive connection
+            video_ids, video_items = await asyncio.to_thread(
+                self._fetch_video_items, search_query, max_results, frozenset(known)
             )
 
-            video_ids = [
-                item["id"]["videoId"] for item in search_response.get("items", [])
-            ]
-
             if not video_ids:
                 logger.info(f"No videos found for query: {search_query}")
                 return []
 
-            # Get detailed video statistics and content details
-            videos_response = await asyncio.to_thread(
-                lambda: (
-                    self.youtube.videos()
-                    .list(
-                        id=",".join(video_ids), part="snippet,contentDetails,statistics"
-                    )
-                    .execute()
-                )
-            )
-
-            results = []
-            for item in videos_response.get("items", []):
+            for item in video_items:
                 try:
-                    # Parse ISO 8601 duration to seconds
-                    duration_iso = item["contentDetails"]["duration"]
-                    duration_seconds = int(
-                        isodate.parse_duration(duration_iso).total_seconds()
-                    )
-
-                    # Get view count
-                    view_count = int(item["statistics"].get("viewCount", 0))
-
-                    # Get thumbnail (prefer high quality)
-                    thumbnails = item["snippet"]["thumbnails"]
-                    thumbnail_url = (
-                        thumbnails.get("high", {}).get("url")
-                        or thumbnails.get("medium", {}).get("url")
-                        or thumbnails.get("default", {}).get("url", "")
-                    )
-
-                    results.append(
-                        {
-                            "video_id": item["id"],
-                            "title": item["snippet"]["title"],
-                            "thumbnail_url": thumbnail_url,
-                            "duration": duration_seconds,
-                            "views": view_count,
-                        }
-                    )
+                    result = self._parse_video_item(item)
+                    known[result["video_id"]] = result
+                    self._cache_video(result)
                 except (KeyError, ValueError) as e:
                     logger.warning(
                         f"Error parsing video data for {item.get('id')}: {e}"
                     )
                     continue
 
-            # Results are already ordered by relevance from YouTube API
+            # Keep the relevance order of the search hits
+            results = [known[video_id] for video_id in video_ids if video_id in known]
+
             logger.info(f"Found {len(results)} videos for query: {search_query}")
             return results
 
@@ -0,0 +1,17 @@
+"""
+Shared Jinja2 template environment.
+
+Every route module and the SSE renderer use this one instance, so templates
+are loaded and compiled once per process instead of once per module.
+"""
+
+from fastapi.templating import Jinja2Templates
+
+from app.config import settings
+
+templates = Jinja2Templates(directory="app/templates")
+
+# Inside Docker the templates are baked into the image and never change, so
+# skip the per-render mtime check. Outside Docker (development) keep it, so
+# template edits show up without a restart.
+templates.env.auto_reload = not settings.is_docker()
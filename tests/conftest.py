@@ -63,7 +63,10 @@ async def initialized_db(tmp_path, monkeypatch):
     """
     from app.config import settings
     from app.database import init_db
+    from app.services.queue_manager import queue_manager
 
     monkeypatch.setattr(settings, "data_dir", tmp_path)
     await init_db()
+    # The global manager may hold a snapshot of a previous test's database.
+    queue_manager.invalidate()
     return tmp_path
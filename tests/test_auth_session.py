@@ -45,3 +45,60 @@ def test_expired_token_rejected(monkeypatch):
     token = auth.encode_session({"username": "alice", "is_admin": False})
     monkeypatch.setattr(auth, "SESSION_MAX_AGE", -1)
     assert auth.decode_session(token) is None
+
+
+def test_verified_session_cached(monkeypatch):
+    """A repeat decode of the same cookie skips signature verification."""
+    monkeypatch.setattr(auth, "_session_cache", {})
+    token = auth.encode_session({"username": "bob", "is_admin": False})
+    assert auth.decode_session(token) == {"username": "bob", "is_admin": False}
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("signature re-verified on a cache hit")
+
+    monkeypatch.setattr(auth.serializer, "loads", _boom)
+    assert auth.decode_session(token) == {"username": "bob", "is_admin": False}
+
+
+def test_cached_session_still_expires(monkeypatch):
+    """A cached session is dropped once it is older than SESSION_MAX_AGE."""
+    monkeypatch.setattr(auth, "_session_cache", {})
+    token = auth.encode_session({"username": "bob", "is_admin": False})
+    assert auth.decode_session(token) is not None
+
+    monkeypatch.setattr(auth, "SESSION_MAX_AGE", -1)
+    assert auth.decode_session(token) is None
+    assert token not in auth._session_cache
+
+
+def test_session_cache_bounded(monkeypatch):
+    """The cache evicts its oldest entry once SESSION_CACHE_SIZE is reached."""
+    monkeypatch.setattr(auth, "_session_cache", {})
+    monkeypatch.setattr(auth, "SESSION_CACHE_SIZE", 2)
+    tokens = [auth.encode_session({"username": f"user{i}"}) for i in range(3)]
+    for token in tokens:
+        auth.decode_session(token)
+
+    assert list(auth._session_cache) == tokens[1:]
+
+
+async def test_get_session_user_memoized_per_request(monkeypatch):
+    """Repeated lookups on one request decode the cookie only once."""
+    from starlette.requests import Request
+
+    token = auth.encode_session({"username": "carol", "is_admin": True})
+    cookie = f"{auth.SESSION_COOKIE_NAME}={token}".encode()
+    request = Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+    calls = []
+    real_decode = auth.decode_session
+
+    def _counting_decode(session_string):
+        calls.append(session_string)
+        return real_decode(session_string)
+
+    monkeypatch.setattr(auth, "decode_session", _counting_decode)
+
+    assert auth.get_session_user(request) == ("carol", True)
+    assert await auth.require_admin(request) == ("carol", True)
+    assert len(calls) == 1
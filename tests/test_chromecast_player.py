@@ -7,10 +7,16 @@ tests/test_chromecast.py.
 """
 
 import threading
+import time
 from unittest.mock import MagicMock, patch
+from uuid import UUID
 
 from app.services.players import PlaybackOutcome, Player
-from app.services.players.chromecast_player import ChromecastPlayer, DiscoveryListener
+from app.services.players.chromecast_player import (
+    ChromecastPlayer,
+    DiscoveryListener,
+    MediaStatusWaker,
+)
 
 
 def _make_fake_cast(name="Living Room"):
@@ -156,6 +162,71 @@ def test_connect_success_stores_cast():
     assert player._cast is cast
 
 
+def test_connect_to_device_uses_shared_browser_entry():
+    """The cast is built from the browser's CastInfo with the shared zeroconf."""
+    device_uuid = "4a1b5c0e-0000-4000-8000-000000000001"
+    cast_info = MagicMock()
+    cast = _make_fake_cast()
+    zc_patch, browser_patch, _, fake_zconf = _fake_zeroconf_env(
+        {UUID(device_uuid): cast_info}
+    )
+    player = ChromecastPlayer()
+    with (
+        zc_patch,
+        browser_patch,
+        patch(
+            "app.services.players.chromecast_player.pychromecast."
+            "get_chromecast_from_cast_info",
+            return_value=cast,
+        ) as from_info,
+    ):
+        assert player._connect_to_device(device_uuid) is cast
+    from_info.assert_called_once_with(cast_info, fake_zconf)
+    cast.wait.assert_called_once()
+
+
+def test_connect_to_device_missing_returns_none():
+    """A device the browser never sees yields None after the lookup window."""
+    zc_patch, browser_patch, _, _ = _fake_zeroconf_env({})
+    player = ChromecastPlayer()
+    with (
+        zc_patch,
+        browser_patch,
+        patch("app.services.players.chromecast_player.DEVICE_LOOKUP_TIMEOUT", 0),
+    ):
+        result = player._connect_to_device("4a1b5c0e-0000-4000-8000-000000000001")
+    assert result is None
+
+
+def test_connect_to_device_waits_for_discovery():
+    """A device not yet seen is connected as soon as the listener reports it."""
+    device_uuid = UUID("4a1b5c0e-0000-4000-8000-000000000001")
+    services = {}
+    cast = _make_fake_cast()
+    zc_patch, browser_patch, _, _ = _fake_zeroconf_env(services)
+    player = ChromecastPlayer()
+
+    def appear():
+        services[device_uuid] = MagicMock()
+        player._listener.add_cast(device_uuid, "service")
+
+    with (
+        zc_patch,
+        browser_patch,
+        patch(
+            "app.services.players.chromecast_player.pychromecast."
+            "get_chromecast_from_cast_info",
+            return_value=cast,
+        ),
+    ):
+        player._ensure_browser()
+        timer = threading.Timer(0.05, appear)
+        timer.start()
+        started = time.monotonic()
+        assert player._connect_to_device(str(device_uuid)) is cast
+    assert time.monotonic() - started < 5
+
+
 def test_cleanup_quits_and_disconnects():
     """cleanup() quits a non-idle app, disconnects, and clears the cast."""
     cast = _make_fake_cast()
@@ -182,7 +253,7 @@ def test_cleanup_swallows_errors():
 
 
 def _play(player, skip=None, stop=None):
-    """Run play() with time.sleep patched out for speed.
+    """Run play() without waiting for a post-session status update.
 
     Args:
         player: Player under test.
@@ -193,7 +264,7 @@ def _play(player, skip=None, stop=None):
         The PlaybackOutcome.
     """
     skip_event, stop_event = _events()
-    with patch("app.services.players.chromecast_player.time.sleep", MagicMock()):
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0):
         return player.play("dQw4w9WgXcQ", skip or skip_event, stop or stop_event)
 
 
@@ -219,7 +290,7 @@ def test_play_accepts_and_ignores_next_up_text():
     cast = _make_fake_cast()
     player = _connected_player(cast)
     skip_event, stop_event = _events()
-    with patch("app.services.players.chromecast_player.time.sleep", MagicMock()):
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0):
         outcome = player.play(
             "dQw4w9WgXcQ",
             skip_event,
@@ -260,7 +331,7 @@ def test_play_skip_returns_skipped_and_clears_event():
     player = _connected_player(cast)
     skip_event, stop_event = _events()
     skip_event.set()
-    with patch("app.services.players.chromecast_player.time.sleep", MagicMock()):
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0):
         outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
     assert outcome is PlaybackOutcome.SKIPPED
     assert not skip_event.is_set()
@@ -273,7 +344,7 @@ def test_play_stop_returns_stopped_event_left_set():
     player = _connected_player(cast)
     skip_event, stop_event = _events()
     stop_event.set()
-    with patch("app.services.players.chromecast_player.time.sleep", MagicMock()):
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0):
         outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
     assert outcome is PlaybackOutcome.STOPPED
     assert stop_event.is_set()
@@ -295,7 +366,7 @@ def test_play_max_duration_times_out():
     player = _connected_player(cast)
     skip_event, stop_event = _events()
     with (
-        patch("app.services.players.chromecast_player.time.sleep", MagicMock()),
+        patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0),
         patch(
             "app.services.players.chromecast_player.time.monotonic",
             side_effect=[0.0, 10**9],
@@ -306,6 +377,102 @@ def test_play_max_duration_times_out():
     cast.media_controller.stop.assert_called()
 
 
+def test_play_wakes_on_media_status_update():
+    """A pushed status update ends playback without waiting out the poll."""
+    cast = _make_fake_cast()
+    cast.media_controller.status.player_state = "PLAYING"
+    player = _connected_player(cast)
+    skip_event, stop_event = _events()
+
+    def finish_soon():
+        waker = cast.media_controller.register_status_listener.call_args.args[0]
+        cast.media_controller.status.player_state = "IDLE"
+        waker.new_media_status(cast.media_controller.status)
+
+    timer = threading.Timer(0.05, finish_soon)
+    with (
+        patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0),
+        patch("app.services.players.chromecast_player.STATUS_WAIT_TIMEOUT", 30),
+    ):
+        timer.start()
+        started = time.monotonic()
+        outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
+    assert outcome is PlaybackOutcome.FINISHED
+    assert time.monotonic() - started < 5
+
+
+def test_play_wake_honors_skip_without_waiting_out_timeout():
+    """Setting skip then calling wake() ends a blocked play() right away."""
+    cast = _make_fake_cast()
+    cast.media_controller.status.player_state = "PLAYING"
+    player = _connected_player(cast)
+    skip_event, stop_event = _events()
+
+    def skip():
+        skip_event.set()
+        player.wake()
+
+    timer = threading.Timer(0.05, skip)
+    with (
+        patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 0),
+        patch("app.services.players.chromecast_player.STATUS_WAIT_TIMEOUT", 30),
+    ):
+        timer.start()
+        started = time.monotonic()
+        outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
+    assert outcome is PlaybackOutcome.SKIPPED
+    assert time.monotonic() - started < 5
+
+
+def test_play_starts_monitoring_on_first_fresh_status():
+    """After session start, play() proceeds on the next pushed status update."""
+    cast = _make_fake_cast()
+    player = _connected_player(cast)
+    skip_event, stop_event = _events()
+
+    def push_status():
+        waker = cast.media_controller.register_status_listener.call_args.args[0]
+        waker.new_media_status(cast.media_controller.status)
+
+    timer = threading.Timer(0.05, push_status)
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 30):
+        timer.start()
+        started = time.monotonic()
+        outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
+    assert outcome is PlaybackOutcome.FINISHED
+    assert time.monotonic() - started < 5
+
+
+def test_play_keeps_status_pushed_before_session_wait_returns():
+    """A status that lands with session activation is not discarded."""
+    cast = _make_fake_cast()
+    player = _connected_player(cast)
+    skip_event, stop_event = _events()
+
+    def activate_session(timeout=None):
+        # pychromecast notifies listeners on its socket thread right after
+        # setting session_active_event, before play() observes it.
+        waker = cast.media_controller.register_status_listener.call_args.args[0]
+        waker.new_media_status(cast.media_controller.status)
+        return True
+
+    cast.media_controller.session_active_event.wait.side_effect = activate_session
+    with patch("app.services.players.chromecast_player.STATUS_REFRESH_TIMEOUT", 30):
+        started = time.monotonic()
+        outcome = player.play("dQw4w9WgXcQ", skip_event, stop_event)
+    assert outcome is PlaybackOutcome.FINISHED
+    assert time.monotonic() - started < 5
+
+
+def test_play_registers_status_listener_once_per_cast():
+    """Consecutive songs on one connection share a single status listener."""
+    cast = _make_fake_cast()
+    player = _connected_player(cast)
+    _play(player)
+    _play(player)
+    cast.media_controller.register_status_listener.assert_called_once()
+
+
 def test_play_exception_maps_to_failed():
     """An exception inside playback is caught and mapped to FAILED."""
     cast = _make_fake_cast()
@@ -314,70 +481,136 @@ def test_play_exception_maps_to_failed():
     assert _play(player) is PlaybackOutcome.FAILED
 
 
+def test_media_status_waker_ignores_repeated_state():
+    """Only a change of (player_state, idle_reason) sets the wake event."""
+    waker = MediaStatusWaker()
+    playing = MagicMock(player_state="PLAYING", idle_reason=None)
+
+    waker.new_media_status(playing)
+    assert waker.changed.is_set()
+    waker.changed.clear()
+    waker.fresh.clear()
+
+    waker.new_media_status(MagicMock(player_state="PLAYING", idle_reason=None))
+    assert not waker.changed.is_set()
+    assert waker.fresh.is_set()
+
+    waker.new_media_status(MagicMock(player_state="IDLE", idle_reason="FINISHED"))
+    assert waker.changed.is_set()
+
+    waker.reset()
+    waker.new_media_status(MagicMock(player_state="IDLE", idle_reason="FINISHED"))
+    assert waker.changed.is_set()
+
+
 # ---------------------------------------------------------------------------
 # DiscoveryListener
 # ---------------------------------------------------------------------------
 
 
-def test_discovery_listener_remove_and_noops():
-    """remove_cast deletes a known uuid; add/update are no-ops."""
+def test_discovery_listener_mirrors_browser_devices():
+    """add/update copy the browser's CastInfo; remove_cast drops it."""
     listener = DiscoveryListener()
+    listener.browser = MagicMock()
     uuid = "uuid-1"
-    listener.devices[uuid] = MagicMock()
+    info, newer = MagicMock(), MagicMock()
+    listener.browser.devices = {uuid: info}
+
     listener.add_cast(uuid, "service")
+    assert listener.get(uuid) is info
+    assert listener.snapshot() == [info]
+    assert listener.seen_event(uuid).is_set()
+
+    listener.browser.devices[uuid] = newer
     listener.update_cast(uuid, "service")
-    listener.remove_cast(uuid, "service", MagicMock())
-    assert uuid not in listener.devices
+    assert listener.get(uuid) is newer
+
+    listener.remove_cast(uuid, "service", newer)
+    assert listener.get(uuid) is None
+    assert not listener.seen_event(uuid).is_set()
     listener.remove_cast("missing", "service", MagicMock())
 
 
+def test_discovery_listener_ignores_unknown_uuid():
+    """A callback for a uuid the browser does not hold records nothing."""
+    listener = DiscoveryListener()
+    listener.browser = MagicMock()
+    listener.browser.devices = {}
+    listener.add_cast("uuid-1", "service")
+    assert listener.snapshot() == []
+    assert not listener.seen_event("uuid-1").is_set()
+
+
 # ---------------------------------------------------------------------------
 # discover_devices
 # ---------------------------------------------------------------------------
 
 
 def _fake_zeroconf_env(services):
-    """Return (patch_ctx_managers, browser, aiozc) for a scripted scan.
+    """Return (patch_ctx_managers, browser, zconf) for a scripted scan.
+
+    The fake browser reports every entry in `services` to its listener when
+    discovery starts, like a real CastBrowser seeing devices answer.
 
     Args:
-        services: Dict for the fake browser's .services attribute.
+        services: Dict for the fake browser's device table (uuid -> CastInfo).
 
     Returns:
-        Tuple of (AsyncZeroconf patch, CastBrowser patch, browser, aiozc).
+        Tuple of (Zeroconf patch, CastBrowser patch, browser, zconf).
     """
     fake_browser = MagicMock()
-    fake_browser.services = services
-    fake_aiozc = MagicMock()
-    fake_aiozc.zeroconf = MagicMock()
+    fake_browser.devices = services
+    fake_zconf = MagicMock()
 
-    async def fake_close():
-        return None
+    def build_browser(listener, zconf):
+        fake_browser.start_discovery.side_effect = lambda: [
+            listener.add_cast(uuid, "service") for uuid in list(services)
+        ]
+        return fake_browser
 
-    fake_aiozc.async_close.side_effect = fake_close
     zc_patch = patch(
-        "app.services.players.chromecast_player.AsyncZeroconf",
-        return_value=fake_aiozc,
+        "app.services.players.chromecast_player.Zeroconf",
+        return_value=fake_zconf,
     )
     browser_patch = patch(
         "app.services.players.chromecast_player.CastBrowser",
-        return_value=fake_browser,
+        side_effect=build_browser,
     )
-    return zc_patch, browser_patch, fake_browser, fake_aiozc
+    return zc_patch, browser_patch, fake_browser, fake_zconf
 
 
 async def test_discover_devices_returns_device_dicts():
-    """The patched zeroconf path returns name/uuid dicts and cleans up."""
+    """The patched zeroconf path returns name/uuid dicts and keeps browsing."""
     player = ChromecastPlayer()
     svc = MagicMock()
     svc.friendly_name = "Den Cast"
     svc.uuid = "uuid-xyz"
-    zc_patch, browser_patch, fake_browser, fake_aiozc = _fake_zeroconf_env({"k": svc})
+    zc_patch, browser_patch, fake_browser, _ = _fake_zeroconf_env({"k": svc})
     with zc_patch, browser_patch:
         devices = await player.discover_devices(timeout=0)
     assert devices == [{"name": "Den Cast", "uuid": "uuid-xyz"}]
     fake_browser.start_discovery.assert_called_once()
-    fake_browser.stop_discovery.assert_called_once()
-    fake_aiozc.async_close.assert_called_once()
+    fake_browser.stop_discovery.assert_not_called()
+
+
+async def test_discover_devices_reuses_shared_browser():
+    """Later scans read the running browser without re-creating or waiting."""
+    player = ChromecastPlayer()
+    svc = MagicMock()
+    svc.friendly_name = "Den Cast"
+    svc.uuid = "uuid-xyz"
+    zc_patch, browser_patch, fake_browser, _ = _fake_zeroconf_env({"k": svc})
+    with zc_patch as zc_cls, browser_patch as browser_cls:
+        await player.discover_devices(timeout=0)
+        with patch(
+            "app.services.players.chromecast_player.asyncio.sleep"
+        ) as sleep_mock:
+            devices = await player.discover_devices(timeout=10)
+    assert devices == [{"name": "Den Cast", "uuid": "uuid-xyz"}]
+    sleep_mock.assert_not_called()
+    assert zc_cls.call_count == 1
+    assert browser_cls.call_count == 1
+    fake_browser.start_discovery.assert_called_once()
 
 
 async def test_discover_devices_disconnects_idle_connection():
@@ -414,7 +647,7 @@ async def test_discover_devices_returns_empty_on_exception():
     player = ChromecastPlayer()
     with (
         patch(
-            "app.services.players.chromecast_player.AsyncZeroconf",
+            "app.services.players.chromecast_player.Zeroconf",
             return_value=MagicMock(),
         ),
         patch(
@@ -424,3 +657,16 @@ async def test_discover_devices_returns_empty_on_exception():
     ):
         devices = await player.discover_devices(timeout=0)
     assert devices == []
+    assert player._browser is None
+
+
+def test_shutdown_stops_shared_browser():
+    """shutdown() stops the discovery browser once and forgets it."""
+    player = ChromecastPlayer()
+    zc_patch, browser_patch, fake_browser, _ = _fake_zeroconf_env({})
+    with zc_patch, browser_patch:
+        player._ensure_browser()
+    player.shutdown()
+    player.shutdown()
+    fake_browser.stop_discovery.assert_called_once()
+    assert player._browser is None
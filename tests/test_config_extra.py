@@ -58,6 +58,16 @@ def test_get_video_path():
     )
 
 
+def test_path_helpers_follow_data_dir_reassignment(tmp_path):
+    """Cached paths are reused, then rebuilt when data_dir is reassigned."""
+    settings = _make(data_dir="/tmp/karaoke-data")
+    assert settings.get_videos_dir() is settings.get_videos_dir()
+
+    settings.data_dir = tmp_path
+    assert settings.get_videos_dir() == tmp_path / "videos"
+    assert settings.get_db_path() == tmp_path / "karaoke.db"
+
+
 # Pilot mode
 
 
@@ -111,6 +121,27 @@ def test_is_docker_false(monkeypatch):
     assert _make().is_docker() is False
 
 
+def test_is_docker_stats_once(monkeypatch):
+    """Repeated is_docker calls reuse the first /.dockerenv check."""
+    import app.config as config_module
+
+    checks = []
+
+    class _FakePath:
+        def __init__(self, _path):
+            pass
+
+        def exists(self):
+            checks.append(1)
+            return True
+
+    settings = _make()
+    monkeypatch.setattr(config_module, "Path", _FakePath)
+    assert settings.is_docker() is True
+    assert settings.is_docker() is True
+    assert len(checks) == 1
+
+
 # Local IP detection
 
 
@@ -144,6 +175,57 @@ def test_get_local_ip_failure(monkeypatch):
     assert _make().get_local_ip() == "localhost"
 
 
+def test_get_local_ip_cached_after_success(monkeypatch):
+    """Only the first successful probe opens a socket; later calls reuse it."""
+    opened = []
+
+    class _FakeSocket:
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+
+        def connect(self, _addr):
+            return None
+
+        def getsockname(self):
+            return ("192.168.1.42", 12345)
+
+        def close(self):
+            return None
+
+    monkeypatch.setattr(socket, "socket", _FakeSocket)
+    settings = _make()
+    assert settings.get_local_ip() == "192.168.1.42"
+    assert settings.get_local_ip() == "192.168.1.42"
+    assert len(opened) == 1
+
+
+def test_get_local_ip_failure_not_cached(monkeypatch):
+    """A failed probe is retried on the next call rather than cached."""
+    settings = _make()
+
+    def _boom(*args, **kwargs):
+        raise OSError("no network")
+
+    monkeypatch.setattr(socket, "socket", _boom)
+    assert settings.get_local_ip() == "localhost"
+
+    class _FakeSocket:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def connect(self, _addr):
+            return None
+
+        def getsockname(self):
+            return ("10.1.1.1", 12345)
+
+        def close(self):
+            return None
+
+    monkeypatch.setattr(socket, "socket", _FakeSocket)
+    assert settings.get_local_ip() == "10.1.1.1"
+
+
 # Server host resolution
 
 
@@ -199,6 +281,31 @@ def test_get_video_url_request_host_fallback(monkeypatch):
     assert url == "http://myhost.local:8000/data/videos/abcdefghijk.mp4"
 
 
+def test_frozen_prefix_skips_host_resolution(monkeypatch):
+    """After freeze_video_url_prefix(), URLs no longer resolve the host."""
+    calls = []
+
+    def _host(self):
+        calls.append(1)
+        return "192.168.0.10"
+
+    monkeypatch.setattr(Settings, "get_server_host", _host)
+    settings = _make(server_host="", server_port=9000)
+    assert settings.freeze_video_url_prefix() == "http://192.168.0.10:9000/data/videos/"
+    url = settings.get_video_url("abcdefghijk")
+    assert url == "http://192.168.0.10:9000/data/videos/abcdefghijk.mp4"
+    assert len(calls) == 1
+
+
+def test_frozen_prefix_defers_to_request_host(monkeypatch):
+    """An explicit request_host still takes the per-call resolution path."""
+    monkeypatch.setattr(Settings, "get_server_host", lambda self: "")
+    settings = _make(server_host="", server_port=8000)
+    settings.freeze_video_url_prefix()
+    url = settings.get_video_url("abcdefghijk", request_host="myhost.local")
+    assert url == "http://myhost.local:8000/data/videos/abcdefghijk.mp4"
+
+
 # Validators
 
 
@@ -282,3 +389,11 @@ def test_load_settings_exits_on_validation_error(monkeypatch):
     with pytest.raises(SystemExit) as exc:
         config_module.load_settings()
     assert exc.value.code == 1
+
+
+def test_get_settings_returns_shared_instance():
+    """get_settings() hands back the module singleton without reloading."""
+    import app.config as config_module
+
+    assert config_module.get_settings() is config_module.settings
+    assert config_module.get_settings() is config_module.get_settings()
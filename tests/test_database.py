@@ -0,0 +1,95 @@
+"""Tests for the database connection helpers in app.database."""
+
+import logging
+
+import app.database as database_module
+from app.database import (
+    SQL_COUNT_ACTIVE,
+    SQL_DELETE_OLDER_THAN,
+    SQL_SELECT_ACTIVE_QUEUE,
+    SQL_SELECT_PLAYING,
+    close_db,
+    get_db,
+    open_db,
+)
+
+
+async def test_get_db_reuses_shared_connection(initialized_db):
+    """After open_db(), every get_db() yields the same open connection."""
+    await open_db()
+    try:
+        async with get_db() as first:
+            pass
+        async with get_db() as second:
+            cursor = await second.execute("SELECT COUNT(*) FROM queue")
+            assert (await cursor.fetchone())[0] == 0
+        assert first is second
+        assert first is database_module._connection
+    finally:
+        await close_db()
+    assert database_module._connection is None
+
+
+async def test_get_db_falls_back_without_shared_connection(initialized_db):
+    """Without open_db(), get_db() opens a short-lived, configured connection."""
+    async with get_db() as db:
+        cursor = await db.execute("PRAGMA foreign_keys")
+        assert (await cursor.fetchone())[0] == 1
+    assert database_module._connection is None
+
+
+async def test_close_db_without_open_is_noop():
+    """close_db() is safe to call when no shared connection exists."""
+    await close_db()
+    assert database_module._connection is None
+
+
+async def test_init_db_persists_wal_mode(initialized_db):
+    """init_db leaves the database in WAL mode for every later connection."""
+    async with get_db() as db:
+        cursor = await db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await db.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+
+async def test_init_db_self_checks_only_at_debug(tmp_path, monkeypatch, caplog):
+    """The startup self-checks run only when DEBUG logging is enabled."""
+    from app.config import settings
+    from app.database import init_db
+
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+
+    with caplog.at_level(logging.INFO, logger="app.database"):
+        await init_db()
+    assert "Database write test successful" not in caplog.text
+
+    with caplog.at_level(logging.DEBUG, logger="app.database"):
+        await init_db()
+    assert "Database write test successful" in caplog.text
+
+
+async def test_active_queries_use_partial_index(initialized_db):
+    """The active-queue listing and count are served by idx_queue_active."""
+    async with get_db() as db:
+        for sql in (SQL_SELECT_ACTIVE_QUEUE, SQL_COUNT_ACTIVE):
+            cursor = await db.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(row[3] for row in await cursor.fetchall())
+            assert "idx_queue_active" in plan
+            assert "TEMP B-TREE" not in plan
+
+
+async def test_playing_lookup_uses_partial_index(initialized_db):
+    """The now-playing query reads idx_queue_playing instead of the table."""
+    async with get_db() as db:
+        cursor = await db.execute(f"EXPLAIN QUERY PLAN {SQL_SELECT_PLAYING}")
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "idx_queue_playing" in plan
+
+
+async def test_age_cleanup_range_scans_added_at(initialized_db):
+    """The cleanup DELETE compares the raw column, so it can use the index."""
+    async with get_db() as db:
+        cursor = await db.execute(f"EXPLAIN QUERY PLAN {SQL_DELETE_OLDER_THAN}", ("x",))
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "idx_queue_added_at" in plan
@@ -46,6 +46,19 @@ async def test_migration_drops_unique_and_preserves_rows(tmp_path, monkeypatch):
         ).fetchone()[0]
         assert "UNIQUE" not in schema_sql.upper()
 
+        # The rebuilt table still carries the queue indexes.
+        indexes = {
+            r[0]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='queue'"
+            )
+        }
+        assert {
+            "idx_queue_added_at",
+            "idx_queue_active",
+            "idx_queue_playing",
+        } <= indexes
+
         # The original row survived the rebuild.
         names = conn.execute(
             "SELECT username FROM queue WHERE video_id='dQw4w9WgXcQ'"
@@ -1,10 +1,11 @@
 """Unit tests for app.main wiring: health check, root, and the cleanup job.
 
-The TestClient is created WITHOUT a `with` block so the lifespan (scheduler,
+The TestClient is created WITHOUT a `with` block so the lifespan (cleanup loop,
 chromecast, ffmpeg checks) never runs. Only the request/response path and the
 standalone cleanup coroutine are exercised.
 """
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -16,6 +17,12 @@ from app.main import app, cleanup_old_queue_items
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def _expire_health_cache(monkeypatch):
+    """Start every test with an expired /health queue-size cache."""
+    monkeypatch.setitem(main_module._health_cache, "t", float("-inf"))
+
+
 def test_health_check(monkeypatch):
     """/health reports status, queue size and playing state."""
     monkeypatch.setattr(
@@ -31,6 +38,17 @@ def test_health_check(monkeypatch):
     assert isinstance(body["is_playing"], bool)
 
 
+def test_health_check_caches_queue_size(monkeypatch):
+    """Probes within the TTL reuse one COUNT(*) instead of querying each time."""
+    get_size = AsyncMock(return_value=4)
+    monkeypatch.setattr(main_module.queue_manager, "get_queue_size", get_size)
+
+    for _ in range(3):
+        assert client.get("/health").json()["queue_size"] == 4
+
+    get_size.assert_awaited_once()
+
+
 def test_root_redirect_to_login():
     """The root path renders the login page (auth.router owns '/')."""
     response = client.get("/", follow_redirects=False)
@@ -38,6 +56,13 @@ def test_root_redirect_to_login():
     assert response.status_code == 200
 
 
+def test_videos_mount_always_registered():
+    """/data/videos is mounted even before the lifespan creates the dir."""
+    assert any(getattr(route, "name", None) == "videos" for route in app.routes)
+    response = client.get("/data/videos/missing-video.mp4")
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_cleanup_removes_items_and_videos(monkeypatch):
     """The cleanup job logs both removed queue items and unreferenced videos."""
@@ -82,3 +107,45 @@ async def test_cleanup_swallows_exceptions(monkeypatch):
 
     # Must not raise.
     await cleanup_old_queue_items()
+
+
+async def test_cleanup_loop_runs_after_each_interval(monkeypatch):
+    """The cleanup loop sleeps one interval, cleans up, and stops on cancel."""
+    sleeps = []
+
+    async def _fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) > 2:
+            raise asyncio.CancelledError
+
+    cleanup = AsyncMock()
+    monkeypatch.setattr(main_module.asyncio, "sleep", _fake_sleep)
+    monkeypatch.setattr(main_module, "cleanup_old_queue_items", cleanup)
+
+    with pytest.raises(asyncio.CancelledError):
+        await main_module._cleanup_loop(2)
+
+    assert sleeps == [7200, 7200, 7200]
+    assert cleanup.await_count == 2
+
+
+def test_resolve_ffmpeg_uses_executable_ffmpeg_path(tmp_path, monkeypatch):
+    """An executable FFMPEG_PATH is used without searching PATH."""
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text("")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setattr(main_module.settings, "ffmpeg_path", str(ffmpeg))
+    monkeypatch.setattr(main_module.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+
+    assert main_module._resolve_ffmpeg() == str(ffmpeg)
+
+
+def test_resolve_ffmpeg_bad_path_falls_back_to_which(tmp_path, monkeypatch, caplog):
+    """A missing FFMPEG_PATH is reported and PATH is searched instead."""
+    monkeypatch.setattr(
+        main_module.settings, "ffmpeg_path", str(tmp_path / "no-such-ffmpeg")
+    )
+    monkeypatch.setattr(main_module.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+
+    assert main_module._resolve_ffmpeg() == "/usr/bin/ffmpeg"
+    assert "FFMPEG_PATH" in caplog.text
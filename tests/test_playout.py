@@ -126,7 +126,7 @@ def _run_loop(service):
     with (
         patch.object(service, "_update_status_sync", MagicMock()) as update_mock,
         patch.object(service, "_remove_from_queue_sync", MagicMock()) as remove_mock,
-        patch("app.services.playout.time.sleep", MagicMock()),
+        patch("app.services.playout.INTER_SONG_PAUSE", 0),
     ):
         service._playout_loop()
     return update_mock, remove_mock
@@ -245,6 +245,33 @@ def test_skip_current_when_playing_sets_event():
     assert service.skip_requested.is_set()
 
 
+def test_skip_current_does_not_take_playout_lock():
+    """skip_current only reads the playing flag, so it never waits on the lock."""
+    service = PlayoutService(FakePlayer())
+    service.is_playing = True
+    with service.playout_lock:
+        result = service.skip_current()
+    assert result["success"] is True
+    assert service.skip_requested.is_set()
+
+
+def test_skip_and_stop_wake_backend():
+    """skip/stop call the backend's optional wake() after setting the event."""
+    wake_saw = []
+    player = FakePlayer()
+    player.wake = MagicMock(
+        side_effect=lambda: wake_saw.append(
+            (service.skip_requested.is_set(), service.stop_requested.is_set())
+        )
+    )
+    service = PlayoutService(player)
+    service.is_playing = True
+
+    service.skip_current()
+    service.stop_playback()
+    assert wake_saw == [(True, False), (True, True)]
+
+
 def test_shutdown_joins_running_thread():
     """shutdown sets stop, clears is_playing, and joins a live thread."""
     service = PlayoutService(FakePlayer())
@@ -500,12 +527,35 @@ def test_connect_failure_stops_cleanly_without_cleanup():
     service = PlayoutService(player)
     service.is_playing = True
     with patch.object(service, "_get_queue_sync", MagicMock(return_value=[])):
-        with patch("app.services.playout.time.sleep", MagicMock()):
-            service._playout_loop()
+        service._playout_loop()
     assert service.is_playing is False
     assert player.cleaned_up is False
 
 
+def test_stop_during_inter_song_pause_exits_promptly():
+    """A stop set while pausing between songs ends the loop without waiting."""
+
+    class _StopAfterSong(FakePlayer):
+        def play(self, video_id, skip_event, stop_event, next_up_text=None):
+            outcome = super().play(video_id, skip_event, stop_event, next_up_text)
+            stop_event.set()
+            return outcome
+
+    service = PlayoutService(_StopAfterSong([PlaybackOutcome.FINISHED]))
+    queue_mock = MagicMock(return_value=[_item(1)])
+    with (
+        patch.object(service, "_get_queue_sync", queue_mock),
+        patch.object(service, "_update_status_sync", MagicMock()),
+        patch.object(service, "_remove_from_queue_sync", MagicMock()),
+        patch("app.services.playout.INTER_SONG_PAUSE", 30),
+    ):
+        worker = threading.Thread(target=service._playout_loop)
+        worker.start()
+        worker.join(timeout=2)
+    assert not worker.is_alive()
+    assert queue_mock.call_count == 1
+
+
 def test_cleanup_runs_after_loop_exits():
     """cleanup() is invoked in the finally block after a normal stop."""
     service, _, _ = _run_one_song(PlaybackOutcome.FINISHED)
@@ -569,6 +619,21 @@ async def test_get_queue_sync_includes_username(initialized_db):
     assert rows[0]["username"] == "alice"
 
 
+async def test_get_queue_sync_reuses_queue_snapshot(initialized_db):
+    """Idle polls are served from queue_manager's snapshot until it changes."""
+    service = PlayoutService(FakePlayer())
+    service.set_event_loop(asyncio.get_running_loop())
+    qid = await _insert_song()
+
+    first = await asyncio.to_thread(service._get_queue_sync)
+    assert await asyncio.to_thread(service._get_queue_sync) is first
+
+    await asyncio.to_thread(service._update_status_sync, qid, "playing")
+    after = await asyncio.to_thread(service._get_queue_sync)
+    assert after is not first
+    assert after[0]["status"] == "playing"
+
+
 def test_bridges_without_loop_raise():
     """The bridges refuse to run before set_event_loop has been called."""
     service = PlayoutService(FakePlayer())
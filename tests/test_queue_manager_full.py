@@ -30,6 +30,16 @@ def _fresh_manager():
     return QueueManager()
 
 
+async def _settle_broadcasts(qm):
+    """Wait until every background broadcast of qm has been sent.
+
+    Args:
+        qm: QueueManager whose send tasks to await.
+    """
+    while qm._broadcast_tasks:
+        await asyncio.gather(*qm._broadcast_tasks)
+
+
 async def _insert_row(video_id, username, added_at, status="queued"):
     """Insert a queue row directly, bypassing add_to_queue's broadcast.
 
@@ -68,6 +78,20 @@ async def test_add_returns_queued_and_blocks_self_duplicate(initialized_db):
         await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
 
 
+async def test_concurrent_duplicate_adds_insert_once(initialized_db):
+    """Racing adds of one (video_id, user) pair leave a single row."""
+    qm = _fresh_manager()
+
+    results = await asyncio.gather(
+        *(qm.add_to_queue("vid1", "Song", "", 100, 1, "alice") for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert sum(isinstance(r, dict) for r in results) == 1
+    assert sum(isinstance(r, ValueError) for r in results) == 2
+    assert await qm.get_queue_size() == 1
+
+
 async def test_add_allows_different_user_same_video(initialized_db):
     """A different username may queue the same video_id."""
     qm = _fresh_manager()
@@ -151,6 +175,7 @@ async def test_remove_admin_and_owner_and_permission(initialized_db):
     # Non-owner, non-admin is rejected.
     with pytest.raises(PermissionError):
         await qm.remove_from_queue(b["id"], username="mallory")
+    assert [item["id"] for item in await qm.get_queue()] == [b["id"]]
 
 
 async def test_remove_missing_returns_false(initialized_db):
@@ -235,11 +260,16 @@ async def test_cleanup_old_videos_keeps_referenced_and_recent(initialized_db):
     fresh = videos_dir / "freshVid0001.mp4"
     fresh.write_bytes(b"x")
 
+    from app.services.download import download_service
+
+    assert download_service.is_downloaded("staleVid0001") is True
+
     deleted = await qm.cleanup_old_videos(hours_threshold=4)
     assert deleted == 1
     assert referenced.exists()
     assert fresh.exists()
     assert not stale.exists()
+    assert download_service.is_downloaded("staleVid0001") is False
 
 
 async def test_cleanup_old_videos_missing_dir(initialized_db):
@@ -284,7 +314,35 @@ async def test_subscribe_yields_initial_then_broadcast(initialized_db):
     assert "vid1" in update or "Song" in update
 
     await gen.aclose()
-    assert qm._connections == []
+    assert qm._connections == {}
+
+
+async def test_heartbeat_task_feeds_clients_and_stops_with_them(
+    initialized_db, monkeypatch
+):
+    """One shared task queues heartbeats; it is cancelled with the last client."""
+    import app.services.queue_manager as queue_manager_module
+
+    monkeypatch.setattr(queue_manager_module, "SSE_HEARTBEAT_INTERVAL", 0.01)
+    qm = _fresh_manager()
+
+    first = qm.subscribe("alice", is_admin=False)
+    second = qm.subscribe("bob", is_admin=False)
+    await first.__anext__()
+    await second.__anext__()
+    task = qm._heartbeat_task
+    assert task is not None
+
+    assert await first.__anext__() == queue_manager_module.SSE_HEARTBEAT_EVENT
+    assert await second.__anext__() == queue_manager_module.SSE_HEARTBEAT_EVENT
+    assert qm._heartbeat_task is task
+
+    await first.aclose()
+    assert not task.done()
+    await second.aclose()
+    assert qm._heartbeat_task is None
+    await asyncio.sleep(0)
+    assert task.cancelled()
 
 
 async def test_subscribe_admin_template_renders(initialized_db):
@@ -296,7 +354,7 @@ async def test_subscribe_admin_template_renders(initialized_db):
     initial = await gen.__anext__()
     assert initial.startswith("event: queue-update\n")
     await gen.aclose()
-    assert qm._connections == []
+    assert qm._connections == {}
 
 
 async def test_broadcast_no_connections_is_noop(initialized_db):
@@ -304,20 +362,236 @@ async def test_broadcast_no_connections_is_noop(initialized_db):
     qm = _fresh_manager()
     # Should not raise and should not require a queue read.
     await qm.broadcast_queue_update()
-    assert qm._connections == []
+    assert qm._connections == {}
+
+
+async def test_broadcast_replaces_stale_events_for_slow_client(initialized_db):
+    """A client with a full buffer keeps its connection and only the newest update."""
+    import app.services.queue_manager as queue_manager_module
+
+    qm = _fresh_manager()
+
+    slow_queue = asyncio.Queue(maxsize=queue_manager_module.SSE_QUEUE_MAXSIZE)
+    slow_queue.put_nowait("stale-update")
+    slow_queue.put_nowait(queue_manager_module.SSE_HEARTBEAT_EVENT)
+    slow_conn = {"queue": slow_queue, "username": "ghost", "is_admin": False}
+    qm._connections[id(slow_conn)] = slow_conn
+
+    await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    await _settle_broadcasts(qm)
+
+    assert list(qm._connections.values()) == [slow_conn]
+    assert slow_queue.qsize() == 1
+    assert "Song" in slow_queue.get_nowait()
 
 
-async def test_broadcast_prunes_dead_connection(initialized_db):
-    """A connection whose bounded queue is full is pruned during broadcast."""
+async def test_broadcast_reaches_every_client_across_batches(
+    initialized_db, monkeypatch
+):
+    """Yielding between fan-out batches still delivers to every client."""
+    import app.services.queue_manager as queue_manager_module
+
+    monkeypatch.setattr(queue_manager_module, "SSE_BROADCAST_BATCH", 2)
     qm = _fresh_manager()
+    clients = [asyncio.Queue() for _ in range(5)]
+    for client in clients:
+        conn = {"queue": client, "username": "alice", "is_admin": False}
+        qm._connections[id(conn)] = conn
+
+    await qm.broadcast_queue_update()
+    await _settle_broadcasts(qm)
 
-    full_queue = asyncio.Queue(maxsize=1)
-    full_queue.put_nowait("already-full")
-    dead_conn = {"queue": full_queue, "username": "ghost", "is_admin": False}
-    qm._connections.append(dead_conn)
+    assert all(client.qsize() == 1 for client in clients)
 
+
+async def test_broadcast_renders_once_per_viewer(initialized_db, monkeypatch):
+    """Each user gets their own render, shared by their tabs; admins share one."""
+    qm = _fresh_manager()
     await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    renders = []
+    real_render = qm._render_queue_html
+
+    def _counting_render(queue, username=None, is_admin=False):
+        renders.append((username, is_admin))
+        return real_render(queue, username, is_admin)
+
+    monkeypatch.setattr(qm, "_render_queue_html", _counting_render)
+
+    conns = [
+        {"queue": asyncio.Queue(), "username": "alice", "is_admin": False},
+        {"queue": asyncio.Queue(), "username": "alice", "is_admin": False},
+        {"queue": asyncio.Queue(), "username": "bob", "is_admin": False},
+        {"queue": asyncio.Queue(), "username": "admin", "is_admin": True},
+        {"queue": asyncio.Queue(), "username": "root", "is_admin": True},
+    ]
+    qm._connections.update((id(conn), conn) for conn in conns)
+
+    await qm.broadcast_queue_update()
+    await _settle_broadcasts(qm)
+
+    assert sorted(renders, key=repr) == sorted(
+        [("alice", False), ("bob", False), (None, True)], key=repr
+    )
+    alice, alice_tab, bob, admin, root = (c["queue"].get_nowait() for c in conns)
+    assert alice is alice_tab
+    assert admin is root
+    assert alice != bob
+
+    # A new tab for the same user reuses the cached event until the queue changes.
+    gen = qm.subscribe("alice", is_admin=False)
+    assert await gen.__anext__() is alice
+    await gen.aclose()
+    assert len(renders) == 3
+
+
+async def test_user_event_hides_other_users_remove_buttons(initialized_db):
+    """A user's SSE payload only offers Remove on that user's own songs."""
+    qm = _fresh_manager()
+    await qm.add_to_queue("vid1", "Alice Song", "", 100, 1, "alice")
+    await qm.add_to_queue("vid2", "Bob Song", "", 100, 1, "bob")
+
+    bob = await qm._queue_event("bob", is_admin=False)
+    assert "Remove 'Bob Song'" in bob
+    assert "Remove 'Alice Song'" not in bob
+    assert "data-owner" not in bob
+
+
+async def test_long_queue_renders_in_worker_thread(initialized_db, monkeypatch):
+    """Queues at the threshold render off the event loop; shorter ones inline."""
+    import threading
+
+    import app.services.queue_manager as queue_manager_module
 
-    # put_nowait raised QueueFull, so the connection is removed.
-    assert dead_conn not in qm._connections
-    assert qm._connections == []
+    monkeypatch.setattr(queue_manager_module, "RENDER_IN_THREAD_MIN_ITEMS", 2)
+    qm = _fresh_manager()
+    threads = []
+    real_render = qm._render_queue_html
+
+    def _recording_render(queue, username=None, is_admin=False):
+        threads.append(threading.current_thread())
+        return real_render(queue, username, is_admin)
+
+    monkeypatch.setattr(qm, "_render_queue_html", _recording_render)
+
+    await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    await qm._queue_event("alice", False)
+    await qm.add_to_queue("vid2", "Other", "", 100, 1, "alice")
+    await qm._queue_event("alice", False)
+
+    main = threading.current_thread()
+    assert threads[0] is main
+    assert threads[1] is not main
+
+
+async def test_write_returns_before_broadcast_is_sent(initialized_db):
+    """A write schedules the broadcast instead of waiting for the fan-out."""
+    qm = _fresh_manager()
+    client = asyncio.Queue()
+    conn = {"queue": client, "username": "alice", "is_admin": False}
+    qm._connections[id(conn)] = conn
+
+    await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    assert client.qsize() == 0
+    assert qm._broadcast_tasks
+
+    await _settle_broadcasts(qm)
+    assert client.qsize() == 1
+    assert qm._broadcast_tasks == set()
+
+
+async def test_broadcast_burst_coalesces_into_trailing_update(initialized_db):
+    """A burst sends the first change at once and folds the rest into one."""
+    qm = _fresh_manager()
+    client = asyncio.Queue()
+    conn = {"queue": client, "username": "alice", "is_admin": False}
+    qm._connections[id(conn)] = conn
+
+    await qm.add_to_queue("vid1", "First", "", 100, 1, "alice")
+    await _settle_broadcasts(qm)
+    assert client.qsize() == 1
+    await qm.add_to_queue("vid2", "Second", "", 100, 1, "alice")
+    await qm.add_to_queue("vid3", "Third", "", 100, 1, "alice")
+    await asyncio.sleep(0)
+    assert client.qsize() == 1
+
+    await qm._pending_broadcast
+    assert client.qsize() == 2
+    client.get_nowait()
+    assert "Third" in client.get_nowait()
+    assert qm._pending_broadcast is None
+
+
+async def test_get_queue_served_from_snapshot_until_change(initialized_db):
+    """Reads reuse the cached snapshot; a write invalidates it."""
+    qm = _fresh_manager()
+    await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+
+    first = await qm.get_queue()
+    assert await qm.get_queue() is first
+    assert await qm.get_queue_size() == 1
+
+    version = qm.version
+    await qm.add_to_queue("vid2", "Other", "", 100, 1, "bob")
+    assert qm.version > version
+
+    updated = await qm.get_queue()
+    assert updated is not first
+    assert [item["video_id"] for item in updated] == ["vid1", "vid2"]
+    assert await qm.get_queue_size() == 2
+
+
+async def test_currently_playing_served_from_snapshot(initialized_db, monkeypatch):
+    """With a current snapshot, the now-playing lookup needs no query."""
+    import app.services.queue_manager as qm_module
+
+    qm = _fresh_manager()
+    row = await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    await qm.update_status(row["id"], "playing")
+    queue = await qm.get_queue()
+
+    def _no_db():
+        raise AssertionError("snapshot should have served the read")
+
+    monkeypatch.setattr(qm_module, "get_db", _no_db)
+    assert await qm.get_currently_playing() is queue[0]
+
+
+async def test_get_queue_does_not_cache_read_raced_by_write(
+    initialized_db, monkeypatch
+):
+    """A snapshot read while a write lands is returned but not cached."""
+    import app.services.queue_manager as qm_module
+
+    qm = _fresh_manager()
+    await qm.add_to_queue("vid1", "Song", "", 100, 1, "alice")
+    real_get_db = qm_module.get_db
+
+    def _racing_get_db():
+        qm.invalidate()  # simulate a write landing mid-read
+        return real_get_db()
+
+    monkeypatch.setattr(qm_module, "get_db", _racing_get_db)
+
+    assert [item["video_id"] for item in await qm.get_queue()] == ["vid1"]
+    assert qm._snapshot is None
+
+
+async def test_shutdown_cancels_broadcasts_and_heartbeat(initialized_db):
+    """shutdown() leaves no send or heartbeat task running."""
+    qm = _fresh_manager()
+    gen = qm.subscribe("alice", is_admin=False)
+    await gen.__anext__()
+    heartbeat = qm._heartbeat_task
+
+    # Scheduled but not yet run: nothing has yielded to the loop.
+    await qm.broadcast_queue_update()
+    send = qm._pending_broadcast
+    assert send is not None
+
+    await qm.shutdown()
+
+    assert heartbeat.cancelled()
+    assert send.cancelled()
+    assert not qm._broadcast_tasks
+    assert qm._pending_broadcast is None
+    await gen.aclose()
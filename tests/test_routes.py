@@ -2,7 +2,7 @@
 
 Covers auth, search, queue, and admin routes using FastAPI's TestClient with
 mocked services. The TestClient is created WITHOUT a `with` block so the app
-lifespan (scheduler, chromecast, ffmpeg checks) never runs.
+lifespan (cleanup loop, chromecast, ffmpeg checks) never runs.
 
 Authentication is exercised two ways:
 - Dependency overrides for routes guarded only by a `Depends(require_session)`.
@@ -174,6 +174,18 @@ def test_login_admin_wrong_password(monkeypatch, _fresh_admin_limiter):
     assert "Invalid+admin+password" in response.headers["location"]
 
 
+def test_login_admin_non_ascii_password(monkeypatch, _fresh_admin_limiter):
+    """A non-ASCII password attempt is rejected cleanly, not with a 500."""
+    monkeypatch.setattr(auth_module.settings, "admin_password", "s3cret-pass")
+    response = client.post(
+        "/login",
+        data={"username": "admin", "password": "pässwörd"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    assert "Invalid+admin+password" in response.headers["location"]
+
+
 def test_login_admin_missing_password(_fresh_admin_limiter):
     """An admin login without a password is rejected."""
     response = client.post("/login", data={"username": "admin"}, follow_redirects=False)
@@ -217,26 +229,28 @@ def test_decode_session_garbage_returns_none():
     assert decode_session("not-a-token") is None
 
 
-def test_require_session_raises_without_cookie():
+async def test_require_session_raises_without_cookie():
     """require_session raises a 303 redirect when no session is present."""
-    request = SimpleNamespace(cookies={})
+    request = SimpleNamespace(cookies={}, state=SimpleNamespace())
     with pytest.raises(HTTPException) as exc:
-        require_session(request)
+        await require_session(request)
     assert exc.value.status_code == 303
 
 
-def test_require_admin_raises_for_non_admin():
+async def test_require_admin_raises_for_non_admin():
     """require_admin raises a 303 redirect for a non-admin session."""
     token = encode_session({"username": "alice", "is_admin": False})
-    request = SimpleNamespace(cookies={"karaoke_session": token})
+    request = SimpleNamespace(
+        cookies={"karaoke_session": token}, state=SimpleNamespace()
+    )
     with pytest.raises(HTTPException) as exc:
-        require_admin(request)
+        await require_admin(request)
     assert exc.value.status_code == 303
 
 
 def test_get_session_user_no_cookie():
     """get_session_user returns (None, False) with no cookie."""
-    request = SimpleNamespace(cookies={})
+    request = SimpleNamespace(cookies={}, state=SimpleNamespace())
     assert get_session_user(request) == (None, False)
 
 
@@ -268,6 +282,17 @@ def test_search_empty_query():
     assert "Please enter a search query" in response.text
 
 
+def test_search_error_partial_rendered_once():
+    """Repeated error responses reuse the memoized rendered partial."""
+    search_module._search_error_body.cache_clear()
+    for _ in range(3):
+        response = client.post("/search", data={"query": "   "})
+        assert "Please enter a search query" in response.text
+
+    info = search_module._search_error_body.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
 def test_search_rate_limited(monkeypatch):
     """A throttled search returns the slow-down error."""
     monkeypatch.setattr(search_module._search_limiter, "allow", lambda key: False)
@@ -663,6 +688,7 @@ def _admin_mocks(monkeypatch):
     qm.get_currently_playing = AsyncMock(return_value=None)
     qm.remove_from_queue = AsyncMock(return_value=True)
     qm.clear_queue = AsyncMock(return_value=3)
+    qm.version = 0
 
     monkeypatch.setattr(admin_module, "playout_service", cc)
     monkeypatch.setattr(admin_module, "queue_manager", qm)
@@ -955,6 +981,33 @@ def test_admin_status(_admin_mocks):
     assert body["currently_playing"] == {"title": "Song"}
 
 
+def test_admin_status_not_modified_until_state_changes(_admin_mocks):
+    """A poll with a matching ETag gets a bodiless 304 and skips the queue reads."""
+    cc, qm = _admin_mocks
+    client = _admin_client()
+
+    first = client.get("/admin/status")
+    etag = first.headers["etag"]
+
+    qm.get_queue_size.reset_mock()
+    repeat = client.get("/admin/status", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    qm.get_queue_size.assert_not_awaited()
+
+    qm.version = 1
+    changed = client.get("/admin/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    cc.is_playing = True
+    playing = client.get(
+        "/admin/status", headers={"If-None-Match": changed.headers["etag"]}
+    )
+    assert playing.status_code == 200
+    assert playing.json()["is_playing"] is True
+
+
 def test_admin_delete_queue_item_success(_admin_mocks):
     """Admin delete of an existing item returns success."""
     response = _admin_client().delete("/admin/queue/7")
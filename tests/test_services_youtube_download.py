@@ -13,6 +13,8 @@ The suite is fully offline and needs no secrets beyond the dummy env vars that
 conftest.py already exports before the app is imported.
 """
 
+import asyncio
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -114,6 +116,97 @@ def make_http_error(status, content_text):
 # ---------------------------------------------------------------------------
 # YouTube service tests
 # ---------------------------------------------------------------------------
+def test_api_client_built_lazily_once(monkeypatch):
+    """Constructing the service does not build the API client; first use does."""
+    calls = []
+
+    def fake_build(*args, **kwargs):
+        calls.append(args)
+        return MagicMock()
+
+    monkeypatch.setattr("app.services.youtube.build", fake_build)
+    service = YouTubeService()
+    assert calls == []
+
+    client = service.youtube
+    assert service.youtube is client
+    assert calls == [("youtube", "v3")]
+
+
+async def test_search_reuses_http_per_thread(monkeypatch):
+    """Each worker thread keeps one Http for its searches; threads don't share."""
+    service = make_youtube_service(monkeypatch)
+
+    main_http = service._http()
+    assert service._http() is main_http
+    worker_http = await asyncio.to_thread(service._http)
+    assert worker_http is not main_http
+
+    await service.search("song")
+    execute = service.youtube.search.return_value.list.return_value.execute
+    used = execute.call_args.kwargs["http"]
+    assert used is not main_http
+
+
+async def test_search_runs_both_calls_in_one_worker(monkeypatch):
+    """search.list and videos.list share one thread hop and its Http."""
+    service = make_youtube_service(
+        monkeypatch,
+        search_response={"items": [{"id": {"videoId": "aaaaaaaaaaa"}}]},
+        videos_response={"items": [make_video_item("aaaaaaaaaaa")]},
+    )
+    hops = []
+    real_to_thread = asyncio.to_thread
+
+    async def counting_to_thread(func, *args, **kwargs):
+        hops.append(func)
+        return await real_to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr("app.services.youtube.asyncio.to_thread", counting_to_thread)
+
+    await service.search("song")
+
+    assert len(hops) == 1
+    search_exec = service.youtube.search.return_value.list.return_value.execute
+    videos_exec = service.youtube.videos.return_value.list.return_value.execute
+    assert search_exec.call_args.kwargs["http"] is videos_exec.call_args.kwargs["http"]
+
+
+async def test_search_fetches_details_only_for_unseen_videos(monkeypatch):
+    """A new query whose hits were all seen before skips videos.list."""
+    service = make_youtube_service(
+        monkeypatch,
+        search_response={
+            "items": [
+                {"id": {"videoId": "aaaaaaaaaaa"}},
+                {"id": {"videoId": "bbbbbbbbbbb"}},
+            ]
+        },
+        videos_response={
+            "items": [
+                make_video_item("aaaaaaaaaaa", title="First"),
+                make_video_item("bbbbbbbbbbb", title="Second"),
+            ]
+        },
+    )
+    videos_list = service.youtube.videos.return_value.list
+
+    first = await service.search("song")
+    assert videos_list.call_count == 1
+
+    # Different query, same hits in another order: served from the video cache
+    service.youtube.search.return_value.list.return_value.execute.return_value = {
+        "items": [
+            {"id": {"videoId": "bbbbbbbbbbb"}},
+            {"id": {"videoId": "aaaaaaaaaaa"}},
+        ]
+    }
+    second = await service.search("song live")
+    assert videos_list.call_count == 1
+    assert [r["title"] for r in second] == ["Second", "First"]
+    assert second[0] is first[1]
+
+
 async def test_search_parses_multiple_items(monkeypatch):
     """A normal search parses id/title/thumbnail/duration/views for each item."""
     search_response = {
@@ -149,6 +242,16 @@ async def test_search_parses_multiple_items(monkeypatch):
     assert results[1]["views"] == 42
 
 
+@pytest.mark.parametrize(
+    ("duration", "seconds"),
+    [("PT1H2M3S", 3723), ("PT45S", 45), ("PT2H", 7200), ("P1DT1H", 90000)],
+)
+def test_parse_video_item_durations(duration, seconds):
+    """PT#H#M#S takes the regex path; other ISO 8601 forms fall back to isodate."""
+    item = make_video_item("aaaaaaaaaaa", duration=duration)
+    assert YouTubeService._parse_video_item(item)["duration"] == seconds
+
+
 async def test_search_thumbnail_preference(monkeypatch):
     """Thumbnail selection prefers high, then medium, then default."""
     search_response = {
@@ -276,6 +379,56 @@ async def test_search_non_http_exception_generic(monkeypatch):
     assert exc_info.value.user_message == "YouTube search failed. Please try again."
 
 
+async def test_search_cached_per_normalized_query(monkeypatch):
+    """A repeat search (any case/spacing) is served without calling the API."""
+    search_response = {"items": [{"id": {"videoId": "aaaaaaaaaaa"}}]}
+    videos_response = {"items": [make_video_item("aaaaaaaaaaa")]}
+    service = make_youtube_service(
+        monkeypatch, search_response=search_response, videos_response=videos_response
+    )
+
+    first = await service.search("Bohemian Rhapsody")
+    second = await service.search("  bohemian   RHAPSODY ")
+
+    assert second is first
+    assert service.youtube.search.return_value.list.call_count == 1
+
+
+async def test_search_cache_expires(monkeypatch):
+    """An entry older than SEARCH_CACHE_TTL is refetched."""
+    import app.services.youtube as youtube_module
+
+    service = make_youtube_service(monkeypatch, search_response={"items": []})
+    await service.search("test")
+    monkeypatch.setattr(youtube_module, "SEARCH_CACHE_TTL", -1)
+    await service.search("test")
+
+    assert service.youtube.search.return_value.list.call_count == 2
+
+
+async def test_search_errors_not_cached(monkeypatch):
+    """A failed search is retried against the API on the next call."""
+    service = make_youtube_service(monkeypatch, execute_error=RuntimeError("boom"))
+
+    for _ in range(2):
+        with pytest.raises(YouTubeError):
+            await service.search("test")
+
+    assert service.youtube.search.return_value.list.call_count == 2
+    assert service._search_cache == {}
+
+
+async def test_concurrent_identical_searches_share_one_call(monkeypatch):
+    """Identical searches in flight together trigger a single API call."""
+    service = make_youtube_service(monkeypatch, search_response={"items": []})
+
+    results = await asyncio.gather(*(service.search("test") for _ in range(3)))
+
+    assert results == [[], [], []]
+    assert service.youtube.search.return_value.list.call_count == 1
+    assert service._inflight == {}
+
+
 # ---------------------------------------------------------------------------
 # Download service tests
 # ---------------------------------------------------------------------------
@@ -317,6 +470,43 @@ def test_is_downloaded_false_for_missing_file(initialized_db):
     assert service.is_downloaded(VALID_VIDEO_ID) is False
 
 
+def test_is_downloaded_seeded_from_videos_dir(initialized_db, monkeypatch):
+    """Files present at construction are known without a per-call stat."""
+    from app.config import settings
+
+    write_file(settings.get_video_path(VALID_VIDEO_ID), b"real video bytes")
+    write_file(settings.get_video_path("emptyVideo1"), b"")
+    service = VideoDownloadService()
+
+    def _no_stat(self, video_id):
+        raise AssertionError("is_downloaded should not touch the filesystem")
+
+    monkeypatch.setattr(type(settings), "get_video_path", _no_stat)
+    assert service.is_downloaded(VALID_VIDEO_ID) is True
+    assert "emptyVideo1" not in service._present
+
+
+def test_is_downloaded_remembers_hits_until_forgotten(initialized_db, monkeypatch):
+    """A confirmed download skips the stat until forget() is called."""
+    from app.config import settings
+
+    service = VideoDownloadService()
+    video_path = settings.get_video_path(VALID_VIDEO_ID)
+    write_file(video_path, b"real video bytes")
+    assert service.is_downloaded(VALID_VIDEO_ID) is True
+
+    def _no_stat(self, video_id):
+        raise AssertionError("is_downloaded should not touch the filesystem")
+
+    monkeypatch.setattr(type(settings), "get_video_path", _no_stat)
+    assert service.is_downloaded(VALID_VIDEO_ID) is True
+    monkeypatch.undo()
+
+    video_path.unlink()
+    service.forget(VALID_VIDEO_ID)
+    assert service.is_downloaded(VALID_VIDEO_ID) is False
+
+
 async def test_download_invalid_id_raises(initialized_db):
     """An invalid video id is rejected before touching the filesystem."""
     service = VideoDownloadService()
@@ -364,6 +554,54 @@ async def test_download_happy_path(initialized_db, monkeypatch):
     assert video_path.exists()
 
 
+async def test_downloads_of_different_videos_are_bounded(initialized_db, monkeypatch):
+    """No more than MAX_CONCURRENT_DOWNLOADS yt-dlp runs overlap."""
+    import app.services.download as download_module
+
+    monkeypatch.setattr(download_module, "MAX_CONCURRENT_DOWNLOADS", 2)
+    service = VideoDownloadService()
+    active = []
+    peak = []
+
+    async def fake_download_locked(video_id, title, video_path):
+        active.append(video_id)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.remove(video_id)
+        return {"success": True}
+
+    monkeypatch.setattr(service, "_download_locked", fake_download_locked)
+
+    video_ids = [f"video{i:06d}" for i in range(5)]
+    await asyncio.gather(*(service.download(vid) for vid in video_ids))
+
+    assert len(peak) == 5
+    assert max(peak) == 2
+
+
+async def test_download_passes_resolved_ffmpeg_location(initialized_db, monkeypatch):
+    """A startup-resolved ffmpeg path is handed to yt-dlp; None is omitted."""
+    from app.config import settings
+
+    service = VideoDownloadService()
+    seen = []
+
+    def fake_download_sync(video_id, ydl_opts):
+        seen.append(ydl_opts.get("ffmpeg_location"))
+        write_file(settings.get_video_path(video_id), b"x" * 2048)
+
+    monkeypatch.setattr(service, "_download_sync", fake_download_sync)
+
+    service.ffmpeg_location = "/opt/ffmpeg/bin/ffmpeg"
+    await service.download(VALID_VIDEO_ID)
+    settings.get_video_path(VALID_VIDEO_ID).unlink()
+    service.forget(VALID_VIDEO_ID)
+    service.ffmpeg_location = None
+    await service.download(VALID_VIDEO_ID)
+
+    assert seen == ["/opt/ffmpeg/bin/ffmpeg", None]
+
+
 async def test_download_failure_ffmpeg_message(initialized_db, monkeypatch):
     """A ffmpeg error maps to the ffmpeg user_message and cleans up partials."""
     from app.config import settings
@@ -459,22 +697,125 @@ def test_download_sync_invokes_yt_dlp(initialized_db, monkeypatch):
     service = VideoDownloadService()
 
     captured = {}
-    ydl_context = MagicMock()
-    ydl_instance = ydl_context.__enter__.return_value
+    ydl_instance = MagicMock()
+    ydl_instance.params = {"outtmpl": {"default": "unset"}}
 
     def fake_youtubedl(opts):
-        """Record opts and return a context manager that records the URL."""
+        """Record opts and return the fake instance."""
         captured["opts"] = opts
-        return ydl_context
+        return ydl_instance
 
     monkeypatch.setattr("app.services.download.yt_dlp.YoutubeDL", fake_youtubedl)
 
-    service._download_sync(VALID_VIDEO_ID, {"format": "best"})
+    opts = {"format": "best", "outtmpl": "/videos/x.%(ext)s"}
+    service._download_sync(VALID_VIDEO_ID, opts)
 
     ydl_instance.download.assert_called_once_with(
         [f"https://www.youtube.com/watch?v={VALID_VIDEO_ID}"]
     )
-    assert captured["opts"] == {"format": "best"}
+    assert captured["opts"] == opts
+    assert ydl_instance.params["outtmpl"]["default"] == "/videos/x.%(ext)s"
+
+
+def test_download_sync_reuses_youtubedl_instance(initialized_db, monkeypatch):
+    """Downloads with the same options reuse one YoutubeDL, retargeting outtmpl."""
+    service = VideoDownloadService()
+    built = []
+
+    def fake_youtubedl(opts):
+        ydl = MagicMock()
+        ydl.params = {"outtmpl": {"default": opts["outtmpl"]}}
+        built.append(ydl)
+        return ydl
+
+    monkeypatch.setattr("app.services.download.yt_dlp.YoutubeDL", fake_youtubedl)
+
+    service._download_sync("aaaaaaaaaaa", {"format": "best", "outtmpl": "a.%(ext)s"})
+    service._download_sync("bbbbbbbbbbb", {"format": "best", "outtmpl": "b.%(ext)s"})
+    assert len(built) == 1
+    assert built[0].params["outtmpl"]["default"] == "b.%(ext)s"
+
+    # Different options (e.g. a new ffmpeg path) retire the pooled instance.
+    service._download_sync("ccccccccccc", {"format": "worst", "outtmpl": "c.%(ext)s"})
+    assert len(built) == 2
+    built[0].close.assert_called_once()
+
+
+def test_download_sync_drops_instance_after_failure(initialized_db, monkeypatch):
+    """A YoutubeDL whose download raised is closed, not returned to the pool."""
+    service = VideoDownloadService()
+    built = []
+
+    def fake_youtubedl(opts):
+        ydl = MagicMock()
+        ydl.params = {"outtmpl": {"default": opts["outtmpl"]}}
+        built.append(ydl)
+        return ydl
+
+    monkeypatch.setattr("app.services.download.yt_dlp.YoutubeDL", fake_youtubedl)
+    opts = {"format": "best", "outtmpl": "a.%(ext)s"}
+
+    service._download_sync("aaaaaaaaaaa", opts)
+    built[0].download.side_effect = RuntimeError("Video unavailable")
+    with pytest.raises(RuntimeError):
+        service._download_sync("bbbbbbbbbbb", opts)
+    built[0].close.assert_called_once()
+
+    service._download_sync("ccccccccccc", opts)
+    assert len(built) == 2
+
+
+async def test_download_runs_on_dedicated_threads(initialized_db, monkeypatch):
+    """yt-dlp work runs on the service's own pool, not the default executor."""
+    from app.config import settings
+
+    service = VideoDownloadService()
+    thread_names = []
+
+    def fake_download_sync(video_id, ydl_opts):
+        thread_names.append(threading.current_thread().name)
+        write_file(settings.get_video_path(video_id), b"x" * 2048)
+
+    monkeypatch.setattr(service, "_download_sync", fake_download_sync)
+    try:
+        await service.download(VALID_VIDEO_ID)
+    finally:
+        service.shutdown()
+
+    assert thread_names[0].startswith("yt-dlp")
+
+
+def test_shutdown_closes_pooled_youtubedl(initialized_db, monkeypatch):
+    """shutdown() closes idle YoutubeDL instances and stops the executor."""
+    service = VideoDownloadService()
+    ydl = MagicMock()
+    ydl.params = {"outtmpl": {"default": ""}}
+    monkeypatch.setattr("app.services.download.yt_dlp.YoutubeDL", lambda opts: ydl)
+
+    service._download_sync(VALID_VIDEO_ID, {"outtmpl": "a.%(ext)s"})
+    service.shutdown()
+
+    ydl.close.assert_called_once()
+    assert service._executor is None
+
+
+async def test_download_works_after_shutdown(initialized_db, monkeypatch):
+    """A later lifespan can download again after shutdown() released the pool."""
+    from app.config import settings
+
+    service = VideoDownloadService()
+
+    def fake_download_sync(video_id, ydl_opts):
+        write_file(settings.get_video_path(video_id), b"x" * 2048)
+
+    monkeypatch.setattr(service, "_download_sync", fake_download_sync)
+    service.shutdown()
+    try:
+        result = await service.download(VALID_VIDEO_ID)
+    finally:
+        service.shutdown()
+
+    assert result["success"] is True
 
 
 async def test_get_video_lock_identity(initialized_db):
@@ -487,3 +828,28 @@ async def test_get_video_lock_identity(initialized_db):
 
     assert lock_a1 is lock_a2
     assert lock_a1 is not lock_b
+
+
+async def test_concurrent_requests_for_same_video_download_once(
+    initialized_db, monkeypatch
+):
+    """A burst of requests for one video runs yt-dlp once; the rest reuse it."""
+    from app.config import settings
+
+    service = VideoDownloadService()
+    calls = []
+
+    def fake_download_sync(video_id, ydl_opts):
+        """Record the call and write a non-empty output file."""
+        calls.append(video_id)
+        write_file(settings.get_video_path(video_id), b"x" * 2048)
+
+    monkeypatch.setattr(service, "_download_sync", fake_download_sync)
+
+    results = await asyncio.gather(
+        *(service.download(VALID_VIDEO_ID, title="popular") for _ in range(4))
+    )
+
+    assert calls == [VALID_VIDEO_ID]
+    assert all(result["success"] for result in results)
+    assert sum(r["message"] == "Video already downloaded" for r in results) == 3